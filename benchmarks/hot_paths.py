@@ -0,0 +1,363 @@
+"""
+Wall time and peak memory of the project's hot paths on synthetic OHLC data.
+
+Every (case, bars) pair runs in a fresh interpreter. Inputs are built before
+timing, the best of a few timed repeats is recorded, and peak memory is the
+tracemalloc peak of one extra run. Each run is appended to a JSON lines file
+with the commit and library versions, and compared with the previous run of
+the same case and size so regressions and speedups show up over time.
+
+The pairs_trading notebook build and calc functions are executed from the
+notebook source, so they are measured as written there.
+
+Usage:
+    python benchmarks/hot_paths.py [--cases build_signal backtest] [--sizes 1000 100000]
+                                   [--repeat 3] [--timeout 600] [--output benchmarks/results/hot_paths.jsonl]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tracemalloc
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# the project folders import the shared performance package from the repository root
+sys.path.insert(0, ROOT)
+
+MOMENTUM = os.path.join(ROOT, 'momentum', 'momentum-python-bybit')
+SEASONALITY = os.path.join(ROOT, 'crude_seasonality')
+MEAN_REVERSION = os.path.join(ROOT, 'mean_reversion')
+PAIRS = os.path.join(ROOT, 'pairs_trading')
+
+SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+DEFAULT_OUTPUT = os.path.join(ROOT, 'benchmarks', 'results', 'hot_paths.jsonl')
+
+
+def synthetic_ohlc(bars: int, seed: int = 0, start: str = '2000-01-01', freq: str = 'min'):
+    """
+    Random walk OHLC bars with a DatetimeIndex. High and Low bound Open and Close.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, bars)))
+    open_ = np.concatenate([[close[0]], close[:-1]]) * np.exp(rng.normal(0, 2e-4, bars))
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, 5e-4, bars)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, 5e-4, bars)))
+
+    index = pd.date_range(start, periods = bars, freq = freq, name = 'Date')
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close,
+                         'Volume': rng.integers(1, 1000, bars)}, index = index)
+
+
+def notebook_functions(path: str, names: list, namespace: dict) -> dict:
+    """
+    Executes the code cells of a notebook that define the given functions.
+    """
+    with open(path, encoding = 'utf-8') as f:
+        cells = json.load(f)['cells']
+
+    for cell in cells:
+        source = ''.join(cell['source'])
+        if cell['cell_type'] == 'code' and any(f'def {name}(' in source for name in names):
+            exec(source, namespace)
+
+    missing = [name for name in names if name not in namespace]
+    if missing:
+        raise RuntimeError(f'Functions not found in {path}: {missing}')
+    return namespace
+
+
+def pairs_dataset(bars: int):
+    """
+    Two symbol dataset in the layout of pairs_currency.ipynb.
+    """
+    import pandas as pd
+
+    frames = []
+    for seed, sym in enumerate(['SYMA', 'SYMB']):
+        data = synthetic_ohlc(bars, seed = seed)[['Open', 'High', 'Low', 'Close']]
+        data.columns = [f'{sym}_{c.lower()}' for c in data.columns]
+        data[f'{sym}_returns'] = data[f'{sym}_close'].diff(1)
+        data[f'{sym}_cumm_returns'] = data[f'{sym}_returns'].cumsum()
+        frames.append(data)
+    return pd.concat(frames, axis = 1).dropna()
+
+
+# each setup builds the inputs for a size and returns the function to time
+
+def setup_build_signal(bars):
+    sys.path.insert(0, MOMENTUM)
+    from spread_momentum.strategy import SpreadMomentum
+
+    strategy = SpreadMomentum.__new__(SpreadMomentum)
+    strategy.spread_period, strategy.z_threshold = 10, 1
+    data = synthetic_ohlc(bars)
+    return lambda: strategy.build_signal(data.copy())
+
+
+def setup_parameter_sweep(bars):
+    sys.path.insert(0, MOMENTUM)
+    from spread_momentum.sweep import ParameterSweep
+
+    close = synthetic_ohlc(bars)['Close']
+    return lambda: ParameterSweep(close, [5, 10, 20, 40], [0.5, 1, 1.5, 2]).summary()
+
+
+def setup_online_signal(bars):
+    sys.path.insert(0, MOMENTUM)
+    from spread_momentum.online import OnlineSpreadMomentum
+
+    close = synthetic_ohlc(bars)['Close']
+    return lambda: OnlineSpreadMomentum(10, 1).run(close)
+
+
+def setup_clean_data(bars):
+    sys.path.insert(0, SEASONALITY)
+    from seasonality import Seasonality
+
+    data = synthetic_ohlc(bars)[['Close']]
+    return lambda: Seasonality.clean_data(data.copy(), 'daily')
+
+
+def seasonality_with_data(bars):
+    sys.path.insert(0, SEASONALITY)
+    from seasonality import Seasonality
+
+    seasonality = Seasonality()
+    seasonality.update_daily_data(synthetic_ohlc(bars + 1)[['Close']])
+    return seasonality
+
+
+def setup_backtest(bars):
+    seasonality = seasonality_with_data(bars)
+    return lambda: seasonality.backtest()
+
+
+def setup_backtest_walk_forward(bars):
+    seasonality = seasonality_with_data(bars)
+    return lambda: seasonality.backtest(walk_forward = True)
+
+
+def mean_reversion_with_data(bars):
+    sys.path.insert(0, MEAN_REVERSION)
+    from mean_reversion import Mean_Reversion
+
+    # skip the constructor, which runs every test
+    model = Mean_Reversion.__new__(Mean_Reversion)
+    model.dataset = synthetic_ohlc(bars)['Close']
+    return model
+
+
+def setup_adf(bars):
+    model = mean_reversion_with_data(bars)
+    return model.get_adf
+
+
+def setup_hurst(bars):
+    model = mean_reversion_with_data(bars)
+    return model.get_hurst
+
+
+def setup_half_life(bars):
+    model = mean_reversion_with_data(bars)
+    return model.get_half_life
+
+
+def setup_rolling_hurst(bars):
+    model = mean_reversion_with_data(bars)
+    return lambda: model.get_rolling_hurst(window = 500, step = 50)
+
+
+def notebook_namespace():
+    import numpy as np
+    import pandas as pd
+    from datetime import datetime as dt
+
+    namespace = {'np': np, 'pd': pd, 'dt': dt, 'sym_1': 'SYMA', 'sym_2': 'SYMB'}
+    return notebook_functions(os.path.join(PAIRS, 'pairs_currency.ipynb'), ['build', 'calc'], namespace)
+
+
+def setup_notebook_build(bars):
+    namespace = notebook_namespace()
+    dataset = pairs_dataset(bars)
+    return lambda: namespace['build'](dataset, 100, spread = 'diff', signal_thresh = 2)
+
+
+def setup_notebook_calc(bars):
+    namespace = notebook_namespace()
+    built = namespace['build'](pairs_dataset(bars), 100, spread = 'diff', signal_thresh = 2)
+    return lambda: namespace['calc'](built, namespace['sym_1_cols'])
+
+
+def setup_trade_ledger(bars):
+    sys.path.insert(0, PAIRS)
+    from trade_ledger import trade_ledger
+
+    namespace = notebook_namespace()
+    built = namespace['build'](pairs_dataset(bars), 100, spread = 'diff', signal_thresh = 2)
+    columns = [built[c] for c in ['SYMA_position', 'SYMA_high', 'SYMA_low', 'SYMA_close']]
+    return lambda: trade_ledger(*columns)
+
+
+def setup_pairs_search(bars):
+    sys.path.insert(0, PAIRS)
+    from optimizer import search
+
+    dataset = pairs_dataset(bars)
+    return lambda: search(dataset, 'SYMA', 'SYMB', [50, 100], [1, 2, 3], max_workers = 1)
+
+
+def setup_bar_simulator(bars):
+    import numpy as np
+
+    sys.path.insert(0, SEASONALITY)
+    from simulator import BarSimulator
+
+    data = synthetic_ohlc(bars, freq = 'h')
+    signal = np.random.default_rng(1).choice([-1, 0, 0, 0, 1], bars)
+    return lambda: BarSimulator(data, signal).sweep([0.5, 1, 2], [1, 2, 5], [5, 24])
+
+
+# case name -> (setup, largest size it runs at)
+CASES = {
+    'build_signal': (setup_build_signal, 10**7),
+    'parameter_sweep': (setup_parameter_sweep, 10**6),
+    'online_signal': (setup_online_signal, 10**5),
+    'clean_data': (setup_clean_data, 10**7),
+    'backtest': (setup_backtest, 10**7),
+    'backtest_walk_forward': (setup_backtest_walk_forward, 10**7),
+    'adf': (setup_adf, 10**5),
+    'hurst': (setup_hurst, 10**6),
+    'half_life': (setup_half_life, 10**7),
+    'rolling_hurst': (setup_rolling_hurst, 10**6),
+    'notebook_build': (setup_notebook_build, 10**6),
+    'notebook_calc': (setup_notebook_calc, 10**6),
+    'trade_ledger': (setup_trade_ledger, 10**6),
+    'pairs_search': (setup_pairs_search, 10**6),
+    'bar_simulator': (setup_bar_simulator, 10**6),
+}
+
+
+def run_case(case: str, bars: int, repeat: int) -> dict:
+    """
+    Times one case in this process. Stops repeating after 10 s of timed runs.
+    """
+    import warnings
+    warnings.filterwarnings('ignore')
+
+    func = CASES[case][0](bars)
+
+    times = []
+    while len(times) < repeat and sum(times) < 10:
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'seconds': min(times), 'repeats': len(times), 'peak_mb': peak / 1024**2}
+
+
+def measure(case: str, bars: int, repeat: int, timeout: float) -> dict:
+    """
+    Runs one case in a fresh interpreter and returns its result or error.
+    """
+    command = [sys.executable, os.path.abspath(__file__), '--child', case, str(bars), str(repeat)]
+    try:
+        result = subprocess.run(command, cwd = ROOT, capture_output = True, text = True, timeout = timeout)
+    except subprocess.TimeoutExpired:
+        return {'error': f'timeout after {timeout} s'}
+
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        return {'error': lines[-1] if lines else f'exit code {result.returncode}'}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def environment() -> dict:
+    import numpy
+    import pandas
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd = ROOT, capture_output = True, text = True).stdout.strip()
+    except OSError:
+        commit = ''
+
+    return {
+        'run': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count()
+    }
+
+
+def previous_results(path: str) -> dict:
+    """
+    Latest successful result of every (case, bars) in a results file.
+    """
+    latest = {}
+    if not os.path.exists(path):
+        return latest
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get('error') is None:
+                latest[(record['case'], record['bars'])] = record
+    return latest
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Benchmark the project hot paths on synthetic data.')
+    parser.add_argument('--cases', nargs = '+', choices = list(CASES), default = list(CASES), help = 'Cases to run')
+    parser.add_argument('--sizes', nargs = '+', type = int, default = SIZES, help = 'Numbers of bars')
+    parser.add_argument('--repeat', type = int, default = 3, help = 'Timed repeats per case, best is kept')
+    parser.add_argument('--timeout', type = float, default = 600, help = 'Seconds allowed per case and size')
+    parser.add_argument('--output', default = DEFAULT_OUTPUT, help = 'JSON lines file the results are appended to')
+    parser.add_argument('--child', nargs = 3, help = argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        case, bars, repeat = args.child
+        print(json.dumps(run_case(case, int(bars), int(repeat))))
+        return
+
+    env = environment()
+    previous = previous_results(args.output)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok = True)
+
+    print(f"{'case':<22} {'bars':>10} {'seconds':>10} {'peak MB':>9} {'previous':>10} {'ratio':>7}")
+    with open(args.output, 'a') as f:
+        for case in args.cases:
+            for bars in sorted(args.sizes):
+                if bars > CASES[case][1]:
+                    continue
+
+                result = measure(case, bars, args.repeat, args.timeout)
+                record = {**env, 'case': case, 'bars': bars, 'seconds': None, 'repeats': None, 'peak_mb': None, 'error': None, **result}
+                f.write(json.dumps(record) + '\n')
+                f.flush()
+
+                if record['error'] is not None:
+                    print(f"{case:<22} {bars:>10} {'error: ' + record['error']}")
+                    continue
+
+                before = previous.get((case, bars))
+                before_s = f"{before['seconds']:>10.4f}" if before else f"{'-':>10}"
+                ratio = f"{record['seconds'] / before['seconds']:>7.2f}" if before else f"{'-':>7}"
+                print(f"{case:<22} {bars:>10} {record['seconds']:>10.4f} {record['peak_mb']:>9.1f} {before_s} {ratio}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Import time budget for the project modules used by scheduled signal jobs.
+
+Each module is imported in a fresh interpreter with `python -X importtime`,
+after numpy and pandas are loaded, so the measured time is what the module
+itself adds. The check fails if a module exceeds its budget or pulls in a
+library that should only be loaded on first use.
+
+Usage:
+    python benchmarks/import_budget.py [--budget-ms 50]
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module name -> folder it is imported from
+TARGETS = {
+    'spread_momentum': os.path.join(ROOT, 'momentum', 'momentum-python-bybit'),
+    'seasonality': os.path.join(ROOT, 'crude_seasonality'),
+    'mean_reversion': os.path.join(ROOT, 'mean_reversion'),
+}
+
+# libraries that are only needed for fetching, plotting or statistics
+DEFERRED = ['pybit', 'matplotlib', 'mplfinance', 'seaborn', 'quandl', 'alpha_vantage', 'statsmodels', 'hurst', 'sklearn']
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(module: str, path: str) -> dict:
+    """
+    Imports module in a subprocess and returns its cumulative import time (ms)
+    and the deferred libraries it loaded.
+    """
+    code = f'import numpy, pandas; import {module}'
+    # the project folders import the shared performance package from the repository root
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=path, env=env, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        error = '\n'.join(line for line in result.stderr.splitlines() if not line.startswith('import time:'))
+        raise RuntimeError(f'Failed to import {module}:\n{error}')
+
+    cumulative_us = None
+    loaded = set()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        name = match.group(4)
+        if name == module:
+            cumulative_us = int(match.group(2))
+        top_level = name.split('.')[0]
+        if top_level in DEFERRED:
+            loaded.add(top_level)
+
+    return {'module': module, 'ms': cumulative_us / 1000, 'deferred_loaded': sorted(loaded)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check project import times against a budget.')
+    parser.add_argument('--budget-ms', type=float, default=50, help='Maximum import time per module in ms')
+    args = parser.parse_args()
+
+    failed = False
+    for module, path in TARGETS.items():
+        result = measure(module, path)
+        over = result['ms'] > args.budget_ms
+        status = 'FAIL' if over or result['deferred_loaded'] else 'ok'
+        failed |= status == 'FAIL'
+
+        loaded = ', '.join(result['deferred_loaded']) or '-'
+        print(f"{module:<20} {result['ms']:>8.1f} ms   deferred loaded: {loaded:<30} {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
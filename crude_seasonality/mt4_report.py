@@ -0,0 +1,181 @@
+import pandas as pd
+import numpy as np
+
+
+# event types of MT4 strategy tester reports
+open_types = ['buy', 'sell']
+close_types = ['s/l', 't/p', 'close']
+
+trade_columns = ['order', 'type', 'open_time', 'close_time', 'size', 'open_price', 'close_price',
+                 'sl', 'tp', 'exit', 'profit', 'balance']
+
+
+class MT4Report:
+
+    """
+    Streams a MT4 strategy tester report (Date,Type,Order,Size,Price,SL,TP,Profit,Balance)
+    in chunks and pairs the open and close events of each order into trades.
+
+    Only orders that are still open are kept between chunks, so memory is bounded
+    by the chunk size and the number of concurrently open orders, not the report
+    length. Pending order events (buy limit, sell limit, delete, modify) are skipped.
+
+    Methods
+    -------
+    trades: Yields completed trades, one DataFrame per chunk
+
+    query: Returns the trades matching a DataFrame.query expression
+
+    summary: Trade statistics, drawdown and per-month profit in one pass
+
+    equity: Balance after every closed trade
+    """
+
+    def __init__(self, path: str, chunksize: int = 100000):
+
+        """
+        Parameters
+        ----------
+        path: str
+            Path to the report csv
+
+        chunksize: int
+            Number of event rows read at a time
+        """
+        self.path = path
+        self.chunksize = chunksize
+
+    def events(self):
+        """
+        Yields the report rows in chunks, with Date parsed
+        """
+        for chunk in pd.read_csv(self.path, chunksize = self.chunksize):
+            chunk['Date'] = pd.to_datetime(chunk['Date'], format = '%Y.%m.%d %H:%M')
+            chunk['Type'] = chunk['Type'].str.strip()
+            yield chunk
+
+    def trades(self):
+        """
+        Yields completed trades, one DataFrame per chunk of events.
+
+        Each trade has the order number, buy or sell, open and close time, size,
+        open and close price, SL and TP at close, the exit type (s/l, t/p or close),
+        profit and the balance after the close.
+        """
+        pending = pd.DataFrame(columns = ['Date', 'Type', 'Size', 'Price']).rename_axis('Order')
+
+        for chunk in self.events():
+            opens = chunk.loc[chunk['Type'].isin(open_types), ['Order', 'Date', 'Type', 'Size', 'Price']]
+            pending = pd.concat([pending, opens.set_index('Order')]) if len(pending) else opens.set_index('Order')
+
+            closes = chunk.loc[chunk['Type'].isin(close_types)]
+            matched = closes.join(pending, on = 'Order', rsuffix = '_open', how = 'inner')
+            pending = pending.drop(matched['Order'], errors = 'ignore')
+
+            yield pd.DataFrame({
+                'order': matched['Order'].to_numpy(),
+                'type': matched['Type_open'].to_numpy(),
+                'open_time': matched['Date_open'].to_numpy(),
+                'close_time': matched['Date'].to_numpy(),
+                'size': matched['Size'].to_numpy(),
+                'open_price': matched['Price_open'].to_numpy(),
+                'close_price': matched['Price'].to_numpy(),
+                'sl': matched['SL'].to_numpy(),
+                'tp': matched['TP'].to_numpy(),
+                'exit': matched['Type'].to_numpy(),
+                'profit': matched['Profit'].to_numpy(dtype = 'float64'),
+                'balance': matched['Balance'].to_numpy(dtype = 'float64')
+            }, columns = trade_columns)
+
+    def query(self, expr: str) -> pd.DataFrame:
+        """
+        Trades matching expr, e.g. "exit == 't/p' and profit > 500".
+        Only the matches of each chunk are kept.
+        """
+        assert type(expr) == str, 'Invalid Data Type for expr'
+        matches = [trades.query(expr) for trades in self.trades()]
+        matches = [m for m in matches if len(m)]
+        return pd.concat(matches, ignore_index = True) if matches else pd.DataFrame(columns = trade_columns)
+
+    def equity(self) -> pd.Series:
+        """
+        Balance after every closed trade, indexed by close time
+        """
+        curves = [pd.Series(trades['balance'].to_numpy(), index = trades['close_time']) for trades in self.trades()]
+        curves = [c for c in curves if len(c)]
+        return pd.concat(curves).rename('balance') if curves else pd.Series(dtype = 'float64', name = 'balance')
+
+    def summary(self):
+
+        """
+        Trade statistics over the whole report in one pass
+
+        Returns
+        -------
+        stats: dict
+            trades, wins, losses, win_rate, net_profit, gross_profit, gross_loss,
+            profit_factor, starting_balance, final_balance, max_drawdown and
+            max_drawdown_pct (percent of the running peak balance)
+
+        monthly: pd.Series
+            Net profit by close month
+
+        Profits are summed as whole cents, so totals are exact and do not depend
+        on the chunk size.
+        """
+        count = wins = losses = 0
+        # profits are reported to the cent of the account currency
+        gross_profit = gross_loss = 0
+        monthly = {}
+        starting_balance = final_balance = peak = None
+        max_drawdown = max_drawdown_pct = 0.0
+
+        for trades in self.trades():
+            if len(trades) == 0:
+                continue
+
+            profit = trades['profit'].to_numpy()
+            balance = trades['balance'].to_numpy()
+
+            if starting_balance is None:
+                starting_balance = balance[0] - profit[0]
+                peak = starting_balance
+
+            count += len(profit)
+            wins += int((profit > 0).sum())
+            losses += int((profit < 0).sum())
+            cents = np.rint(profit * 100).astype('int64')
+            gross_profit += int(cents[cents > 0].sum())
+            gross_loss -= int(cents[cents < 0].sum())
+
+            # running peak carried over from the previous chunks
+            running_peak = np.maximum.accumulate(np.concatenate([[peak], balance]))[1:]
+            drawdown = running_peak - balance
+            max_drawdown = max(max_drawdown, drawdown.max())
+            max_drawdown_pct = max(max_drawdown_pct, (drawdown / running_peak).max() * 100)
+            peak = running_peak[-1]
+            final_balance = balance[-1]
+
+            months = pd.DatetimeIndex(trades['close_time']).to_period('M')
+            for month, total in pd.Series(cents).groupby(months.to_numpy()).sum().items():
+                monthly[month] = monthly.get(month, 0) + int(total)
+
+        net_profit = (gross_profit - gross_loss) / 100
+        gross_profit, gross_loss = gross_profit / 100, gross_loss / 100
+        monthly = pd.Series({month: total / 100 for month, total in sorted(monthly.items())}, dtype = 'float64').rename_axis('close_time')
+
+        stats = {
+            'trades': count,
+            'wins': wins,
+            'losses': losses,
+            'win_rate': wins / count if count else np.nan,
+            'net_profit': net_profit,
+            'gross_profit': gross_profit,
+            'gross_loss': gross_loss,
+            'profit_factor': gross_profit / gross_loss if gross_loss > 0 else np.nan,
+            'starting_balance': starting_balance,
+            'final_balance': final_balance,
+            'max_drawdown': max_drawdown,
+            'max_drawdown_pct': max_drawdown_pct
+        }
+        return stats, monthly.rename('profit')
@@ -1,22 +1,138 @@
 import pandas as pd 
 import numpy as np 
-import matplotlib.pyplot as plt
-import seaborn as sns 
 from datetime import datetime as dt 
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import threading
+import time
 
 import os
-key = os.environ.get('quandl_api_key')
 
-import quandl
-quandl.ApiConfig.api_key = key
+from performance.metrics import annual_returns, month_of_year_returns, performance_summary
+from performance.instrumentation import instrumented, span
+from performance.memory import fits_float32, memory_report
 
-from alpha_vantage.timeseries import TimeSeries
-ts = TimeSeries(key = 'alpha_vantage_api_key', output_format = 'pandas')
+# Data source clients and plotting libraries are loaded on first use, so importing 
+# this module does not pull them in, build clients or change the plot style.
+lazy_modules = {}
 
-import warnings
-warnings.filterwarnings('ignore')
+def get_quandl():
+    if 'quandl' not in lazy_modules:
+        import quandl
+        quandl.ApiConfig.api_key = os.environ.get('quandl_api_key')
+        lazy_modules['quandl'] = quandl
+    return lazy_modules['quandl']
 
-plt.style.use('seaborn-darkgrid')
+def get_time_series():
+    if 'time_series' not in lazy_modules:
+        from alpha_vantage.timeseries import TimeSeries
+        lazy_modules['time_series'] = TimeSeries(key = 'alpha_vantage_api_key', output_format = 'pandas')
+    return lazy_modules['time_series']
+
+def get_pyplot():
+    if 'pyplot' not in lazy_modules:
+        import matplotlib.pyplot as plt
+        plt.style.use('seaborn-darkgrid')
+        lazy_modules['pyplot'] = plt
+    return lazy_modules['pyplot']
+
+timeframes = ['daily', 'monthly']
+calculations = ['mean', 'sum', 'std']
+days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+class ResponseCache:
+    
+    """
+    A local disk cache for data source responses.
+    
+    Entries older than ttl are refetched. When the cache grows past max_bytes, 
+    the least recently written entries are evicted.
+    """
+    
+    def __init__(self, directory: str = '.seasonality_cache', ttl: float = 86400, max_bytes: int = 512 * 1024**2):
+        
+        """
+        Parameters
+        ----------
+        directory: str
+            Folder for cached responses
+            
+        ttl: float
+            Seconds before an entry expires
+            Default: 1 day
+            
+        max_bytes: int
+            Maximum total size of cached entries
+            Default: 512 MB
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        
+    def path(self, key: tuple):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, f'{digest}.pkl')
+    
+    def get(self, key: tuple):
+        
+        """
+        Returns the cached response for key, or None if missing or expired.
+        """
+        path = self.path(key)
+        try:
+            age = time.time() - os.path.getmtime(path)
+            if age > self.ttl:
+                return None
+            return pd.read_pickle(path)
+        except (FileNotFoundError, EOFError):
+            return None
+    
+    def set(self, key: tuple, value):
+        os.makedirs(self.directory, exist_ok = True)
+        path = self.path(key)
+        
+        # unique temp name so concurrent writers never share a file
+        tmp = f'{path}.{threading.get_ident()}.tmp'
+        pd.to_pickle(value, tmp)
+        os.replace(tmp, path)
+        
+        self.evict()
+        
+    def evict(self):
+        
+        """
+        Removes expired entries, then the oldest entries until under max_bytes.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.pkl'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in sorted(entries):
+            if now - mtime <= self.ttl and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            
+    def clear(self):
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(self.directory, name))
 
 
 class Seasonality:
@@ -34,10 +150,16 @@ class Seasonality:
     
     get_data_from_alpha_vantage: Fetches stock data using the AlphaVantage API
     
+    get_fred_from_quandl_many: Fetches FRED data for many codes concurrently
+    
+    get_data_from_alpha_vantage_many: Fetches stock data for many tickers concurrently
+    
     clean_data: Static method for cleaning raw FRED data, and adding necessary columns.
     
     backtest: Backtests returns using the daily timeframe
     
+    backtest_panel: Backtests returns of many assets at once using the daily timeframe
+    
     plot_data_by_month: Measures periodic average change by month
     
     plot_close: Plots close price
@@ -50,6 +172,12 @@ class Seasonality:
     
     plot_annual_returns: Plots annual returns
     
+    summary: Return statistics of every backtested strategy
+    
+    report_job: Backtest returns packaged for headless batch rendering
+    
+    memory_usage: Rows and memory used by the stored dataframes
+    
     update_monthly_data: Updates monthly data with user-specified dataframe
     
     update_daily_data: Updates daily data with user-specified dataframe
@@ -58,7 +186,8 @@ class Seasonality:
     """
     
     
-    def __init__(self, start_date: str = None, end_date: str = None):
+    def __init__(self, start_date: str = None, end_date: str = None, cache: ResponseCache = None, 
+                 quandl_client = None, alpha_vantage_client = None, max_workers: int = 8, compact: bool = False):
         
         """
         Parameters
@@ -68,7 +197,30 @@ class Seasonality:
             
         end_date: str
             End Date for dataset
+            
+        cache: ResponseCache
+            Local cache for data source responses. None disables caching.
+            
+        quandl_client: any
+            Object with a quandl style get(code, **kwargs). Default: the quandl module, imported on first use
+            
+        alpha_vantage_client: any
+            Object with TimeSeries style get_daily and get_monthly. Default: a TimeSeries client, built on first use
+            
+        max_workers: int
+            Maximum number of concurrent requests
+            
+        compact: bool
+            Store cleaned data with categorical calendar fields, int16 years and 
+            float32 prices where precision allows. Returns are kept in float64.
+            Default: False
         """
+        self.cache = cache
+        self.quandl_client = quandl_client
+        self.alpha_vantage_client = alpha_vantage_client
+        self.max_workers = max_workers
+        self.compact = compact
+        
         self.backtest_data = None
         self.monthly_data = None
         self.daily_data = None
@@ -76,11 +228,7 @@ class Seasonality:
         
         self.start_date = start_date
         self.end_date = end_date
-    
-        timeframes = ['daily', 'monthly']
-        calculations = ['mean', 'sum', 'std']
-        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+        self.panel_backtest_data = None
 
 
             
@@ -103,13 +251,41 @@ class Seasonality:
             A dataframe on daily data for the target set. 
         """
         assert type(fred_code) == str, 'Invalid Data Type for fred_code'
-        # MONTHLY 
-        fred = f'FRED/{fred_code}'
-        self.monthly_data = self.clean_data(quandl.get(fred, collapse = 'monthly'), 'monthly', self.start_date, self.end_date)
-        self.daily_data = self.clean_data(quandl.get(fred), 'daily', self.start_date, self.end_date)
+        
+        monthly, daily = self.fetch_all(self.fred_requests(fred_code))
+        self.monthly_data = self.clean_data(monthly, 'monthly', self.start_date, self.end_date, self.compact)
+        self.daily_data = self.clean_data(daily, 'daily', self.start_date, self.end_date, self.compact)
         
         return self.monthly_data, self.daily_data
     
+    def get_fred_from_quandl_many(self, fred_codes: list):
+        
+        """
+        Fetches FRED data for many codes using the Quandl API. All monthly and daily 
+        requests are issued concurrently. Stored monthly and daily data are not changed.
+        
+        Parameters
+        ----------
+        fred_codes: list
+            Codes for target data
+            
+        Returns
+        -------
+        data: dict
+            (monthly_data, daily_data) for each code
+        """
+        assert type(fred_codes) == list, 'Invalid Data Type for fred_codes'
+        
+        requests = [r for code in fred_codes for r in self.fred_requests(code)]
+        responses = self.fetch_all(requests)
+        
+        data = {}
+        for i, code in enumerate(fred_codes):
+            monthly, daily = responses[2*i], responses[2*i + 1]
+            data[code] = (self.clean_data(monthly, 'monthly', self.start_date, self.end_date, self.compact), 
+                          self.clean_data(daily, 'daily', self.start_date, self.end_date, self.compact))
+        return data
+    
     def get_data_from_alpha_vantage(self, ticker_id: str):
         """
         Fetches Stock data using the Alpha Vantage API.
@@ -129,27 +305,107 @@ class Seasonality:
         """
         
         assert type(ticker_id) == str, 'Invalid Data Type for ticker_id'
-        av_daily, meta_data = ts.get_daily(ticker_id, 'full')
-        av_monthly, meta_data = ts.get_monthly(ticker_id)
         
-        d = av_daily[['4. close']][::-1]
-        d = d.reset_index()
-        d.columns = ['Date', 'Close']
-        d = d.set_index('Date', drop = True)
-
-        mon = av_monthly[['4. close']][::-1]
-        mon = mon.reset_index()
-        mon.columns = ['Date', 'Close']
-        mon = mon.set_index('Date', drop = True)
+        (av_monthly, meta_data), (av_daily, meta_data) = self.fetch_all(self.alpha_vantage_requests(ticker_id))
         
-        self.monthly_data = self.clean_data(mon, 'monthly', self.start_date, self.end_date)
-        self.daily_data = self.clean_data(d, 'daily', self.start_date, self.end_date)
+        self.monthly_data = self.clean_data(self.parse_alpha_vantage(av_monthly), 'monthly', self.start_date, self.end_date, self.compact)
+        self.daily_data = self.clean_data(self.parse_alpha_vantage(av_daily), 'daily', self.start_date, self.end_date, self.compact)
         
         return self.monthly_data, self.daily_data
+    
+    def get_data_from_alpha_vantage_many(self, ticker_ids: list):
+        
+        """
+        Fetches Stock data for many tickers using the Alpha Vantage API. All monthly 
+        and daily requests are issued concurrently. Stored monthly and daily data are not changed.
+        
+        Parameters
+        ----------
+        ticker_ids: list
+            Ticker IDs for target stocks
+            
+        Returns
+        -------
+        data: dict
+            (monthly_data, daily_data) for each ticker
+        """
+        assert type(ticker_ids) == list, 'Invalid Data Type for ticker_ids'
+        
+        requests = [r for ticker in ticker_ids for r in self.alpha_vantage_requests(ticker)]
+        responses = self.fetch_all(requests)
+        
+        data = {}
+        for i, ticker in enumerate(ticker_ids):
+            (monthly, _), (daily, _) = responses[2*i], responses[2*i + 1]
+            data[ticker] = (self.clean_data(self.parse_alpha_vantage(monthly), 'monthly', self.start_date, self.end_date, self.compact), 
+                            self.clean_data(self.parse_alpha_vantage(daily), 'daily', self.start_date, self.end_date, self.compact))
+        return data
+    
+    def fred_requests(self, fred_code: str):
+        
+        """
+        (cache key, request) pairs for the monthly and daily data of a FRED code
+        """
+        fred = f'FRED/{fred_code}'
+        client = get_quandl() if self.quandl_client is None else self.quandl_client
+        return [
+            (('quandl', fred, 'monthly'), lambda: client.get(fred, collapse = 'monthly')),
+            (('quandl', fred, 'daily'), lambda: client.get(fred))
+        ]
+    
+    def alpha_vantage_requests(self, ticker_id: str):
+        
+        """
+        (cache key, request) pairs for the monthly and daily data of a ticker
+        """
+        client = get_time_series() if self.alpha_vantage_client is None else self.alpha_vantage_client
+        return [
+            (('alpha_vantage', ticker_id, 'monthly'), lambda: client.get_monthly(ticker_id)),
+            (('alpha_vantage', ticker_id, 'daily'), lambda: client.get_daily(ticker_id, 'full'))
+        ]
+    
+    def fetch(self, key: tuple, request):
+        
+        """
+        Returns the cached response for key, or runs the request and caches its response.
+        """
+        if self.cache is not None:
+            response = self.cache.get(key)
+            if response is not None:
+                return response
+            
+        with span('seasonality.request', key = '/'.join(key)) as s:
+            response = request()
+            if isinstance(response, pd.DataFrame):
+                s.rows = len(response)
+        if self.cache is not None:
+            self.cache.set(key, response)
+        return response
+    
+    def fetch_all(self, requests: list):
+        
+        """
+        Runs (cache key, request) pairs concurrently and returns the responses in order.
+        """
+        with ThreadPoolExecutor(max_workers = max(1, min(self.max_workers, len(requests)))) as executor:
+            futures = [executor.submit(self.fetch, key, request) for key, request in requests]
+            return [future.result() for future in futures]
+        
+    @staticmethod
+    def parse_alpha_vantage(data: pd.DataFrame):
+        
+        """
+        Converts an Alpha Vantage response to an ascending dataframe of close prices.
+        """
+        data = data[['4. close']][::-1]
+        data = data.reset_index()
+        data.columns = ['Date', 'Close']
+        return data.set_index('Date', drop = True)
         
         
     @staticmethod
-    def clean_data(data: pd.DataFrame, timeframe: str, start_date: str = None, end_date: str = None):
+    @instrumented('seasonality.clean_data')
+    def clean_data(data: pd.DataFrame, timeframe: str, start_date: str = None, end_date: str = None, compact: bool = False):
         
         """
         Static method for cleaning raw FRED data, and adding necessary columns.
@@ -167,6 +423,12 @@ class Seasonality:
             
         end_date: str
             End Date of dataset
+            
+        compact: bool
+            Month and day of week as ordered categoricals, year as int16 and Close 
+            as float32 if every price survives the conversion. pct_change is 
+            computed before and kept in float64.
+            Default: False
         
         Returns
         --------
@@ -192,6 +454,15 @@ class Seasonality:
             data['day_of_week'] = data['Date'].dt.dayofweek
             data['day_of_week'] = data['day_of_week'].map({i:d for i, d in enumerate(days)})
             
+        if compact:
+            data['month'] = pd.Categorical(data['month'], categories = months, ordered = True)
+            data['year'] = data['year'].astype('int16')
+            if timeframe == 'daily':
+                # weekend bars are left missing, as in the string column
+                data['day_of_week'] = pd.Categorical(data['day_of_week'], categories = days, ordered = True)
+            if fits_float32(data['Close'].to_numpy(dtype = 'float64')):
+                data['Close'] = data['Close'].astype('float32')
+            
         data = data.set_index('Date', drop = True)
         
         date_format = '%Y-%m-%d'
@@ -206,7 +477,8 @@ class Seasonality:
         return data
     
     
-    def backtest(self, maxdd: float = 1):
+    @instrumented('seasonality.backtest')
+    def backtest(self, maxdd: float = 1, walk_forward: bool = False, min_periods: int = 1):
         
         """
         Backtests returns using the daily dataframe
@@ -217,6 +489,17 @@ class Seasonality:
             Max Drawdown Percent 
             Default: 1%
             
+        walk_forward: bool
+            If False, month and day of week signals are means over the whole sample. 
+            If True, each bar's signal only uses the changes up to and including that 
+            bar, so the shifted signal traded on the next bar never sees its future.
+            Default: False
+            
+        min_periods: int
+            Walk forward only. Number of past changes in a month or day of week 
+            required before taking a position. Bars with less history are flat.
+            Default: 1
+            
         Returns
         -------
         backtest_data: pd.DataFrame
@@ -225,17 +508,24 @@ class Seasonality:
         
         backtest_data = self.daily_data.copy()
         
-        # daily change by month
-        grouped = backtest_data.groupby('month')[['pct_change']].mean().reindex(months)
+        if walk_forward:
+            backtest_data['signal'] = self.expanding_signal(backtest_data, 'month', min_periods)
+            backtest_data['daily_sig'] = self.expanding_signal(backtest_data, 'day_of_week', min_periods)
+            
+        else:
+            # daily change by month
+            grouped = backtest_data.groupby('month', observed = True)[['pct_change']].mean().reindex(months)
 
-        grouped['sig'] = np.where(grouped['pct_change'] > 0, 1, -1)
-        
-        # intraweek change
-        week = backtest_data.groupby('day_of_week')[['pct_change']].mean().reindex(days)
-        week['sig'] = np.where(week['pct_change'] > 0, 1, -1)
-        
-        backtest_data['signal'] = backtest_data['month'].map({m:s for m, s in zip(grouped.index, grouped['sig'])})
-        backtest_data['daily_sig'] = backtest_data['day_of_week'].map({k:l for k,l in zip(week.index, week['sig'])})
+            grouped['sig'] = np.where(grouped['pct_change'] > 0, 1, -1)
+            
+            # intraweek change
+            week = backtest_data.groupby('day_of_week', observed = True)[['pct_change']].mean().reindex(days)
+            week['sig'] = np.where(week['pct_change'] > 0, 1, -1)
+            
+            # mapping a categorical gives a categorical, so map plain values
+            backtest_data['signal'] = backtest_data['month'].astype(object).map({m:s for m, s in zip(grouped.index, grouped['sig'])})
+            backtest_data['daily_sig'] = backtest_data['day_of_week'].astype(object).map({k:l for k,l in zip(week.index, week['sig'])})
+            
         backtest_data['signal_actual'] = np.where(backtest_data['pct_change'] > 0, 1, -1)
         
         backtest_data['strategy_returns'] = backtest_data['pct_change'] * backtest_data['signal'].shift(periods = 1)
@@ -243,8 +533,8 @@ class Seasonality:
         backtest_data['d_sig_returns'] = backtest_data['pct_change'] * backtest_data['daily_sig'].shift(periods = 1)
         
         backtest_data['filtered_returns'] = backtest_data['strategy_returns']
-        backtest_data['filtered_returns'][backtest_data['strategy_returns'] < -maxdd] = -maxdd
-        backtest_data['d_sig_returns'][backtest_data['d_sig_returns'] < -maxdd] = -maxdd
+        backtest_data.loc[backtest_data['strategy_returns'] < -maxdd, 'filtered_returns'] = -maxdd
+        backtest_data.loc[backtest_data['d_sig_returns'] < -maxdd, 'd_sig_returns'] = -maxdd
         
         backtest_data = backtest_data.dropna()
     
@@ -255,6 +545,202 @@ class Seasonality:
     
     
     
+    @staticmethod
+    def expanding_signal(data: pd.DataFrame, period: str, min_periods: int = 1):
+        
+        """
+        Sign of the running mean change of each bar's period (month or day_of_week), 
+        using only that bar and the bars before it.
+        
+        Running sums and counts per period are kept by a grouped cumulative sum, so 
+        the whole history is processed in one pass.
+        
+        Parameters
+        ----------
+        data: pd.DataFrame
+            Cleaned daily data with pct_change and the period column
+            
+        period: str
+            Column to group by (month, day_of_week)
+            
+        min_periods: int
+            Number of changes required before a signal is given. Earlier bars get 0.
+            
+        Returns
+        -------
+        signal: pd.Series
+            1 or -1 by the sign of the running mean, 0 without enough history, 
+            NaN for bars without a period (weekends)
+        """
+        assert type(period) == str, 'Invalid Data Type for period'
+        
+        grouped = data.groupby(period, observed = True)['pct_change']
+        running_sum = grouped.cumsum()
+        running_count = grouped.cumcount() + 1
+        
+        signal = pd.Series(np.where(running_sum > 0, 1.0, -1.0), index = data.index)
+        signal[running_count < min_periods] = 0
+        signal[data[period].isna()] = np.nan
+        return signal
+    
+    def backtest_panel(self, data: pd.DataFrame, maxdd: float = 1, asset_col: str = None):
+        
+        """
+        Backtests returns of many assets at once using daily close prices. 
+        
+        Applies the same month and day of week signals as backtest() to every asset. 
+        Signals for all assets come from one grouped aggregation, and returns are 
+        applied with array operations instead of a loop over assets.
+        
+        Parameters
+        ----------
+        data: pd.DataFrame
+            Wide format: DatetimeIndex with one column of close prices per asset. 
+            
+            Long format: DatetimeIndex or Date column, a Close column and the 
+            asset_col column naming the asset of each row.
+            
+        maxdd: float
+            Max Drawdown Percent 
+            Default: 1%
+            
+        asset_col: str
+            Asset column for long format data. None for wide format.
+            
+        Returns
+        -------
+        summary: pd.DataFrame
+            Total returns of each strategy per asset, and the number of bars tested
+        """
+        assert type(data) == pd.DataFrame, 'Invalid Data Type for data'
+        
+        assets, dates, close = self.panel_arrays(data, asset_col)
+        names, codes = np.unique(assets, return_inverse = True)
+        num_assets = len(names)
+        
+        # sort by asset, then date, so each asset is one contiguous block
+        order = np.lexsort((dates, codes))
+        codes, dates, close = codes[order], dates[order], close[order]
+        
+        same_asset = np.concatenate([[False], codes[1:] == codes[:-1]])
+        prev_close = np.concatenate([[np.nan], close[:-1]])
+        pct_change = np.where(same_asset, (close / prev_close - 1) * 100, np.nan)
+        
+        # same date window as clean_data, which ends before each asset's last day
+        # when end_date is not set
+        index = pd.DatetimeIndex(dates)
+        last_rows = np.append(np.nonzero(codes[1:] != codes[:-1])[0], len(codes) - 1)
+        last_dates = index[last_rows][codes]
+        in_window = ~np.isnan(pct_change) & self.date_window_mask(index, last_dates)
+        
+        codes, index, pct_change = codes[in_window], index[in_window], pct_change[in_window]
+        month = index.month.to_numpy() - 1
+        weekday = index.dayofweek.to_numpy()
+        is_weekday = weekday < len(days)
+        
+        # daily change by month and intraweek change for every asset, in one aggregation
+        month_keys = codes * len(months) + month
+        weekday_keys = num_assets * len(months) + codes[is_weekday] * len(days) + weekday[is_weekday]
+        keys = np.concatenate([month_keys, weekday_keys])
+        values = np.concatenate([pct_change, pct_change[is_weekday]])
+        
+        size = num_assets * (len(months) + len(days))
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            means = np.bincount(keys, weights = values, minlength = size) / np.bincount(keys, minlength = size)
+        
+        month_sig = np.where(means[:num_assets * len(months)] > 0, 1, -1)
+        week_sig = np.where(means[num_assets * len(months):] > 0, 1, -1)
+        
+        signal = month_sig[month_keys].astype(float)
+        daily_sig = np.full(len(codes), np.nan)
+        daily_sig[is_weekday] = week_sig[codes[is_weekday] * len(days) + weekday[is_weekday]]
+        signal_actual = np.where(pct_change > 0, 1.0, -1.0)
+        
+        # previous bar of the same asset
+        same_asset = np.concatenate([[False], codes[1:] == codes[:-1]])
+        def shift(values):
+            return np.where(same_asset, np.concatenate([[np.nan], values[:-1]]), np.nan)
+        
+        strategy_returns = pct_change * shift(signal)
+        actual_returns = pct_change * shift(signal_actual)
+        d_sig_returns = pct_change * shift(daily_sig)
+        
+        filtered_returns = np.where(strategy_returns < -maxdd, -maxdd, strategy_returns)
+        d_sig_returns = np.where(d_sig_returns < -maxdd, -maxdd, d_sig_returns)
+        
+        backtest_data = pd.DataFrame({
+            'asset': names[codes],
+            'pct_change': pct_change, 
+            'month': np.array(months)[month],
+            'year': index.year, 
+            'day_of_week': np.array(days + [None, None], dtype = object)[weekday],
+            'signal': signal,
+            'daily_sig': daily_sig, 
+            'signal_actual': signal_actual, 
+            'strategy_returns': strategy_returns,
+            'actual_returns': actual_returns, 
+            'd_sig_returns': d_sig_returns, 
+            'filtered_returns': filtered_returns
+        }, index = index)
+        backtest_data.index.name = 'Date'
+        backtest_data = backtest_data.dropna()
+        
+        self.panel_backtest_data = backtest_data
+        self.strats_list = ['d_sig_returns', 'filtered_returns', 'strategy_returns', 'actual_returns','pct_change']
+        
+        # per asset totals
+        valid_codes = np.searchsorted(names, backtest_data['asset'].to_numpy())
+        summary = pd.DataFrame({
+            strat: np.bincount(valid_codes, weights = backtest_data[strat].to_numpy(), minlength = num_assets) 
+            for strat in self.strats_list
+        }, index = pd.Index(names, name = 'asset'))
+        summary['bars'] = np.bincount(valid_codes, minlength = num_assets)
+        
+        return summary
+    
+    @staticmethod
+    def panel_arrays(data: pd.DataFrame, asset_col: str = None):
+        
+        """
+        Flattens wide or long format close prices into asset, date and close arrays, dropping missing prices.
+        """
+        if asset_col is None:
+            assert type(data.index) == pd.DatetimeIndex, 'Invalid Index Type'
+            values = data.to_numpy(dtype = 'float64')
+            rows, cols = np.nonzero(~np.isnan(values))
+            assets = data.columns.to_numpy()[cols]
+            dates = data.index.to_numpy()[rows]
+            close = values[rows, cols]
+            return assets, dates, close
+        
+        if asset_col not in data.columns:
+            raise ValueError(f'{asset_col} not found in columns')
+        if 'Close' not in data.columns:
+            raise ValueError('Close not found in columns')
+        
+        data = data.dropna(subset = ['Close'])
+        dates = data.index if 'Date' not in data.columns else pd.DatetimeIndex(data['Date'])
+        assert type(dates) == pd.DatetimeIndex, 'Invalid Index Type'
+        return data[asset_col].to_numpy(), dates.to_numpy(), data['Close'].to_numpy(dtype = 'float64')
+    
+    def date_window_mask(self, index: pd.DatetimeIndex, last_dates: pd.DatetimeIndex = None):
+        
+        """
+        Mask of dates within start_date (inclusive) and end_date (exclusive), as in clean_data. 
+        Without end_date, each date is compared with the day of last_dates, the last date 
+        of its asset, so the final day is left out like clean_data does.
+        """
+        date_format = '%Y-%m-%d'
+        mask = np.ones(len(index), dtype = bool)
+        if self.start_date is not None:
+            mask &= index >= dt.strptime(self.start_date, date_format)
+        if self.end_date is not None:
+            mask &= index < dt.strptime(self.end_date, date_format)
+        elif last_dates is not None:
+            mask &= index < last_dates.normalize()
+        return mask
+        
+    
     def plot_data_by_month(self, timeframe: str, calculation: str):
         
         """
@@ -272,6 +758,7 @@ class Seasonality:
             calculation type (mean, std)
 
         """
+        plt = get_pyplot()
         assert type(timeframe) == str, 'Invalid data type for timeframe'
         assert type(calculation) == str, 'Invalid Calculation Data Type'
         
@@ -295,11 +782,11 @@ class Seasonality:
         
         if calculation == 'mean':
             title = f'Average {timeframe.capitalize()} Change by Month'
-            grouped = data_to_plot.groupby('month').mean().reindex(months)
+            grouped = data_to_plot.groupby('month', observed = True).mean().reindex(months)
             
         elif calculation == 'std':
             title = f'{timeframe.capitalize()} Volatility by Month'
-            grouped = data_to_plot.groupby('month').std().reindex(months)
+            grouped = data_to_plot.groupby('month', observed = True).std().reindex(months)
             
         else:
             raise ValueError('Invalid Calculation Type')
@@ -321,6 +808,7 @@ class Seasonality:
         timeframe: str
             timeframe to plot (daily, monthly)
         """
+        plt = get_pyplot()
         assert type(timeframe) == str, 'Invalid Timeframe Data Type'
         
         if timeframe not in timeframes:
@@ -351,6 +839,8 @@ class Seasonality:
         timeframe: str
             timeframe to plot (daily, monthly)
         """
+        plt = get_pyplot()
+        import seaborn as sns
         
         assert type(timeframe) == str, 'Invalid Timeframe Data Type'
         
@@ -393,6 +883,7 @@ class Seasonality:
         strat: str
             Strategy Type in strats_list
         """
+        plt = get_pyplot()
         assert type(data) == pd.DataFrame, 'Invalid Data Type'
         assert type(strat) == str, 'Invalid Strat Data Type'
         
@@ -421,6 +912,7 @@ class Seasonality:
             Calculation Type
             mean, sum, std
         """
+        plt = get_pyplot()
         assert type(strat) == str, 'Invalid Strat Data Type'
         assert type(calculation) == str, 'Invalid Calculation Data Type'
         
@@ -430,31 +922,23 @@ class Seasonality:
         if calculation not in calculations:
             raise ValueError('Calculation not in calculations list. Allowed Calculations: "mean", "sum", "std"')
         
-        grouped = self.backtest_data.groupby('month')
-        returns_average = grouped.mean()[[strat]].reindex(months)
-        returns_total = grouped.sum()[[strat]].reindex(months)
-        returns_volatility = grouped.std()[[strat]].reindex(months)
+        data_to_plot = month_of_year_returns(self.backtest_data[[strat]], calculation)
         
         # calculation: mean, sum, std
         if calculation == 'mean':
             title = 'Average Daily Returns by Month'
             ylabel = 'Percent Gain'
             label = 'Average Daily Returns (%)'
-            data_to_plot = returns_average
         
         elif calculation == 'sum':
             title = 'Total Daily Returns by Month'
-            grouped = grouped.sum()[[strat]].reindex(months)
             ylabel = 'Percent Gain'
             label = 'Total Daily Returns (%)'
-            data_to_plot = returns_total
             
         elif calculation == 'std':
             title = 'Returns Volatility by Month'
-            grouped = grouped.std()[[strat]].reindex(months)
             ylabel = 'Volatility'
             label = 'Volatility (%)'
-            data_to_plot = returns_volatility
             
         else:
             raise ValueError('Invalid Calculation Type')
@@ -475,6 +959,7 @@ class Seasonality:
         strat: str
             Strategy Type in strats_list
         """
+        plt = get_pyplot()
         assert type(strat) == str, 'Invalid Strat Type'
         
         if self.backtest_data_is_empty():
@@ -483,14 +968,76 @@ class Seasonality:
         if strat not in self.strats_list:
             raise ValueError('Strat not in strats list')
         
-        years = list(self.backtest_data['year'].unique())
-        returns_annual = self.backtest_data.groupby('year')[[strat]].sum().reindex(years)
+        returns_annual = annual_returns(self.backtest_data[[strat]], kind = 'percent')
         returns_annual.plot(kind = 'bar', grid = True, figsize = (12, 6), title = 'Annual Returns')
         plt.xlabel('Year')
         plt.ylabel('Gain (%)')
         plt.legend(labels = ['Annual Returns (%)'])
         
         
+    def summary(self, periods_per_year: float = 252):
+        
+        """
+        Return statistics of every strategy in strats_list
+        
+        Parameters
+        ----------
+        periods_per_year: float
+            Bars per year used to annualize
+            Default: 252
+            
+        Returns
+        -------
+        summary: pd.DataFrame
+            total_return, cagr, volatility, sharpe, sortino, max_drawdown and bars, 
+            one row per strategy
+        """
+        if self.backtest_data_is_empty():
+            raise ValueError('Nothing to test. Run backtest() method first.')
+        
+        return performance_summary(self.backtest_data[self.strats_list], kind = 'percent', periods_per_year = periods_per_year)
+        
+        
+    def report_job(self, name: str, periods_per_year: float = 252):
+        
+        """
+        Backtest returns packaged for performance.render_reports batch rendering
+        
+        Parameters
+        ----------
+        name: str
+            Report name, usually the symbol
+            
+        periods_per_year: float
+            Bars per year used to annualize
+            Default: 252
+        """
+        assert type(name) == str, 'Invalid Data Type for name'
+        
+        if self.backtest_data_is_empty():
+            raise ValueError('Nothing to test. Run backtest() method first.')
+        
+        return {
+            'name': name,
+            'returns': self.backtest_data[self.strats_list],
+            'kind': 'percent',
+            'periods_per_year': periods_per_year,
+            'series': {'close': self.backtest_data['Close']}
+        }
+        
+        
+    def memory_usage(self):
+        """
+        Rows, deep memory (MB) and bytes per row of the stored monthly, daily and 
+        backtest dataframes, to compare runs with and without compact.
+        """
+        return memory_report({
+            'monthly_data': self.monthly_data,
+            'daily_data': self.daily_data,
+            'backtest_data': self.backtest_data
+        })
+        
+        
     def update_monthly_data(self, data: pd.DataFrame):
         """
         Overwrites stored monthly data with user-specified dataframe. 
@@ -513,7 +1060,7 @@ class Seasonality:
         if 'Close' not in data.columns:
             raise ValueError('Close not found in columns')
         
-        self.monthly_data = self.clean_data(data, 'monthly', self.start_date, self.end_date)
+        self.monthly_data = self.clean_data(data, 'monthly', self.start_date, self.end_date, self.compact)
         
         return self.monthly_data
     
@@ -539,7 +1086,7 @@ class Seasonality:
         if 'Close' not in data.columns:
             raise ValueError('Close not found in columns')
             
-        self.daily_data = self.clean_data(data, 'daily', self.start_date, self.end_date)
+        self.daily_data = self.clean_data(data, 'daily', self.start_date, self.end_date, self.compact)
         
         return self.daily_data
         
@@ -551,4 +1098,31 @@ class Seasonality:
             return True
         else:
             return False
-        
\ No newline at end of file
+        
+
+def backtest_returns(data: pd.DataFrame, maxdd: float = 1, min_periods: int = 1, strategy: str = 'filtered_returns'):
+    """
+    Per bar percent returns of Seasonality.backtest with walk_forward = True, the 
+    strategy interface of performance.walk_forward. 
+    
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Daily closes, a Close column on a DatetimeIndex named Date
+        
+    maxdd: float
+        Max Drawdown Percent
+        Default: 1%
+        
+    min_periods: int
+        Past changes required in a month or day of week before taking a position
+        Default: 1
+        
+    strategy: str
+        Backtest column to return (filtered_returns, strategy_returns, d_sig_returns)
+        Default: filtered_returns
+    """
+    seasonality = Seasonality()
+    seasonality.update_daily_data(data[['Close']].copy())
+    backtest_data = seasonality.backtest(maxdd = maxdd, walk_forward = True, min_periods = min_periods)
+    return backtest_data[strategy]
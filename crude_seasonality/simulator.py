@@ -0,0 +1,301 @@
+import pandas as pd
+import numpy as np
+from itertools import product
+
+
+# MT4 strategy tester report columns
+ledger_columns = ['Date', 'Type', 'Order', 'Size', 'Price', 'SL', 'TP', 'Profit', 'Balance']
+
+# exit reasons, as written in the Type column of MT4 reports
+exit_types = np.array(['close', 's/l', 't/p'])
+
+
+class BarSimulator:
+
+    """
+    Simulates trades with stop loss, take profit, hold time and trading window
+    exits on OHLC bars, without MetaTrader.
+
+    A trade opens at the open of every bar with a non-zero signal, inside the
+    trading window. Trades are independent, like the overlapping orders of the
+    MT4 reports. Each trade exits on the first of:
+        - stop loss: the bar's adverse extreme reaches the stop. Filled at the stop,
+          or at the bar's open if the market gapped through it
+        - take profit: the bar's favorable extreme reaches the target. Filled the same way
+        - hold time: the close of the hold_time-th bar of the trade
+        - trading window end: the close of the last bar of the entry day before trading_window_end
+    When the stop and the target are both inside one bar, the stop is assumed to fill first.
+
+    Price paths of every trade are gathered once into (trades x hold time) matrices
+    of moves relative to the entry price, so each parameter set is a few array
+    comparisons.
+
+    Methods
+    -------
+    run: Simulates one parameter set and returns the trade ledger
+
+    sweep: Simulates every combination of parameters and returns one summary row each
+
+    save_report: Writes a ledger in the MT4 report format
+    """
+
+    def __init__(self, data: pd.DataFrame, signal, size: float = 1, contract_size: float = 100, commission: float = 0,
+                 starting_balance: float = 100000, trading_window_start: int = None, trading_window_end: int = None):
+
+        """
+        Parameters
+        ----------
+        data: pd.DataFrame
+            Bars with Open, High, Low and Close (or Price) columns and a DatetimeIndex or Date column
+
+        signal: array-like
+            Direction to open on each bar: 1 buy, -1 sell, 0 or NaN no trade. Must
+            only use information available before the bar opens.
+
+        size: float
+            Lots per trade
+
+        contract_size: float
+            Units per lot. Default: 100 (crude oil CFDs)
+
+        commission: float
+            Commission per lot per side, deducted from each closed trade
+
+        starting_balance: float
+            Initial deposit
+
+        trading_window_start: int
+            First hour of day new trades may open. Default: no limit
+
+        trading_window_end: int
+            Hour of day trades stop opening, and open trades are closed. Default: no limit
+        """
+        assert type(data) == pd.DataFrame, 'Invalid Data Type for data'
+
+        close_col = 'Close' if 'Close' in data.columns else 'Price'
+        for col in ['Open', 'High', 'Low', close_col]:
+            if col not in data.columns:
+                raise ValueError(f'{col} not found in columns')
+
+        if len(signal) != len(data):
+            raise ValueError('Error. Signal and data must have the same length.')
+
+        self.index = pd.DatetimeIndex(data['Date'] if 'Date' in data.columns else data.index)
+        self.open = data['Open'].to_numpy(dtype = 'float64')
+        self.high = data['High'].to_numpy(dtype = 'float64')
+        self.low = data['Low'].to_numpy(dtype = 'float64')
+        self.close = data[close_col].to_numpy(dtype = 'float64')
+
+        self.size = size
+        self.contract_size = contract_size
+        self.commission = commission
+        self.starting_balance = starting_balance
+
+        signal = np.nan_to_num(np.asarray(signal, dtype = 'float64'))
+        hours = self.index.hour.to_numpy()
+
+        allowed = signal != 0
+        if trading_window_start is not None:
+            allowed &= hours >= trading_window_start
+        if trading_window_end is not None:
+            allowed &= hours < trading_window_end
+
+        self.entries = np.flatnonzero(allowed)
+        self.direction = np.sign(signal[self.entries])
+        self.entry_price = self.open[self.entries]
+
+        # number of bars each trade may stay open, before hold time
+        self.limit = len(self.close) - self.entries
+        if trading_window_end is not None:
+            self.limit = np.minimum(self.limit, self.session_last(self.index, trading_window_end)[self.entries] - self.entries + 1)
+
+        self.ledger = None
+        self.paths = None
+
+    @staticmethod
+    def session_last(index: pd.DatetimeIndex, trading_window_end: int) -> np.ndarray:
+        """
+        Position of the last bar before trading_window_end on the same day as each bar.
+        """
+        positions = np.where(index.hour < trading_window_end, np.arange(len(index)), -1)
+        return pd.Series(positions).groupby(index.normalize().to_numpy()).transform('max').to_numpy()
+
+    def build_paths(self, hold_time: int):
+        """
+        Moves of the next hold_time bars relative to each trade's entry price,
+        signed so positive is in the trade's favor.
+        """
+        if self.paths is not None and self.paths['hold_time'] >= hold_time:
+            return self.paths
+
+        offsets = np.arange(hold_time)
+        bars = np.minimum(self.entries[:, None] + offsets, len(self.close) - 1)
+        entry = self.entry_price[:, None]
+        d = self.direction[:, None]
+
+        favorable = np.where(d > 0, self.high[bars], self.low[bars]) / entry - 1
+        adverse = np.where(d > 0, self.low[bars], self.high[bars]) / entry - 1
+
+        self.paths = {
+            'hold_time': hold_time,
+            'bars': bars,
+            'offsets': offsets,
+            'favorable': d * favorable,
+            'adverse': -d * adverse,
+            'open': d * (self.open[bars] / entry - 1),
+            'close': d * (self.close[bars] / entry - 1)
+        }
+        return self.paths
+
+    def exits(self, sl_pct: float, tp_pct: float, hold_time: int):
+        """
+        Exit offset, exit type and signed move of every trade for one parameter set.
+
+        sl_pct and tp_pct are percent of the entry price, None disables them.
+        """
+        paths = self.build_paths(hold_time)
+        offsets = paths['offsets'][:hold_time]
+
+        last = np.minimum(self.limit, hold_time) - 1
+        valid = offsets[None, :] <= last[:, None]
+
+        sl = np.inf if sl_pct is None else sl_pct / 100
+        tp = np.inf if tp_pct is None else tp_pct / 100
+
+        sl_hit = (paths['adverse'][:, :hold_time] >= sl) & valid
+        tp_hit = (paths['favorable'][:, :hold_time] >= tp) & valid
+        hit = sl_hit | tp_hit
+
+        rows = np.arange(len(self.entries))
+        first = np.where(hit.any(axis = 1), hit.argmax(axis = 1), last)
+        stopped = sl_hit[rows, first]
+        target = tp_hit[rows, first] & ~stopped
+
+        # fills at the level, or at the open when the bar gapped past it
+        gap = paths['open'][rows, first]
+        move = paths['close'][rows, first]
+        move = np.where(stopped, np.minimum(-sl, gap), move)
+        move = np.where(target, np.maximum(tp, gap), move)
+
+        exit_type = np.where(stopped, 1, np.where(target, 2, 0))
+        return first, exit_type, move
+
+    def run(self, sl_pct: float = None, tp_pct: float = None, hold_time: int = 1):
+
+        """
+        Simulates one parameter set
+
+        Parameters
+        ----------
+        sl_pct: float
+            Stop loss distance, percent of the entry price. None disables it.
+
+        tp_pct: float
+            Take profit distance, percent of the entry price. None disables it.
+
+        hold_time: int
+            Maximum number of bars a trade is held
+
+        Returns
+        -------
+        ledger: pd.DataFrame
+            Date, Type, Order, Size, Price, SL, TP, Profit, Balance: one row for every
+            open and close, like the MT4 reports. SL and TP are 0 when disabled.
+        """
+        assert type(hold_time) == int, 'Invalid Data Type for hold_time'
+        if hold_time < 1:
+            raise ValueError('Error. hold_time must be at least 1.')
+
+        first, exit_type, move = self.exits(sl_pct, tp_pct, hold_time)
+
+        d = self.direction
+        entry = self.entry_price
+        sl_price = np.zeros(len(entry)) if sl_pct is None else entry * (1 - d * sl_pct / 100)
+        tp_price = np.zeros(len(entry)) if tp_pct is None else entry * (1 + d * tp_pct / 100)
+        exit_bar = self.entries + first
+
+        profit = self.trade_profit(move)
+        orders = np.arange(1, len(entry) + 1)
+
+        opens = pd.DataFrame({
+            'bar': self.entries, 'kind': 0, 'Type': np.where(d > 0, 'buy', 'sell'), 'Order': orders,
+            'Price': entry, 'SL': sl_price, 'TP': tp_price, 'Profit': 0.0
+        })
+        closes = pd.DataFrame({
+            'bar': exit_bar, 'kind': 1, 'Type': exit_types[exit_type], 'Order': orders,
+            'Price': entry * (1 + d * move), 'SL': sl_price, 'TP': tp_price, 'Profit': profit
+        })
+
+        # within a bar, trades open at the open before any exit
+        ledger = pd.concat([opens, closes]).sort_values(['bar', 'kind', 'Order'], kind = 'stable')
+        ledger['Date'] = self.index[ledger['bar'].to_numpy()]
+        ledger['Size'] = self.size
+        ledger['Balance'] = self.starting_balance + ledger['Profit'].cumsum()
+
+        self.ledger = ledger[ledger_columns].reset_index(drop = True)
+        return self.ledger
+
+    def trade_profit(self, move: np.ndarray) -> np.ndarray:
+        """
+        Account currency profit of trades from their signed moves, after commission.
+        """
+        return move * self.entry_price * self.size * self.contract_size - 2 * self.commission * self.size
+
+    def sweep(self, sl_pcts, tp_pcts, hold_times):
+
+        """
+        Simulates every combination of stop loss, take profit and hold time
+
+        Parameters
+        ----------
+        sl_pcts: array-like
+            Stop loss distances to test, percent of entry price. None disables the stop.
+
+        tp_pcts: array-like
+            Take profit distances to test, percent of entry price. None disables the target.
+
+        hold_times: array-like
+            Maximum bars held to test
+
+        Returns
+        -------
+        summary: pd.DataFrame
+            sl_pct, tp_pct, hold_time, trades, net_profit, win_rate, profit_factor,
+            max_drawdown, sl_exits and tp_exits for each combination
+        """
+        hold_times = [int(h) for h in hold_times]
+        if len(hold_times) == 0 or min(hold_times) < 1:
+            raise ValueError('Error. hold_times must be at least 1.')
+
+        # gather the paths once for the longest hold time
+        self.build_paths(max(hold_times))
+
+        rows = []
+        for sl_pct, tp_pct, hold_time in product(sl_pcts, tp_pcts, hold_times):
+            first, exit_type, move = self.exits(sl_pct, tp_pct, hold_time)
+            profit = self.trade_profit(move)
+
+            # balance changes in the order trades close
+            balance = self.starting_balance + np.cumsum(profit[np.argsort(self.entries + first, kind = 'stable')])
+            peak = np.maximum.accumulate(np.concatenate([[self.starting_balance], balance]))[1:]
+
+            gross_loss = -profit[profit < 0].sum()
+            rows.append([
+                sl_pct, tp_pct, hold_time, len(profit), profit.sum(),
+                (profit > 0).mean() if len(profit) else np.nan,
+                profit[profit > 0].sum() / gross_loss if gross_loss > 0 else np.nan,
+                (peak - balance).max() if len(balance) else 0.0,
+                (exit_type == 1).sum(), (exit_type == 2).sum()
+            ])
+
+        return pd.DataFrame(rows, columns = ['sl_pct', 'tp_pct', 'hold_time', 'trades', 'net_profit', 'win_rate',
+                                             'profit_factor', 'max_drawdown', 'sl_exits', 'tp_exits'])
+
+    @staticmethod
+    def save_report(ledger: pd.DataFrame, path: str):
+        """
+        Writes a ledger as a MT4 style report csv (Date as YYYY.MM.DD HH:MM)
+        """
+        report = ledger[ledger_columns].copy()
+        report['Date'] = pd.DatetimeIndex(report['Date']).strftime('%Y.%m.%d %H:%M')
+        report.to_csv(path, index = False)
@@ -0,0 +1,133 @@
+import os
+import json
+import pandas as pd
+import numpy as np
+
+
+# Column layout of the price history exports from investing.com
+RAW_COLUMNS = ['Date', 'Price', 'Open', 'High', 'Low', 'Vol.', 'Change %']
+PRICE_COLUMNS = ['Price', 'Open', 'High', 'Low']
+DATE_FORMAT = '%m/%d/%Y'
+
+VOLUME_SUFFIXES = {'K': 1e3, 'M': 1e6, 'B': 1e9}
+
+
+def load_csv(path: str, cache: bool = True) -> pd.DataFrame:
+    """
+    Loads an investing.com style csv into a typed, ascending dataframe.
+
+    The parsed columns are written to a sidecar folder of .npy files next to the
+    csv. Later loads memory-map the sidecar instead of parsing the text again,
+    as long as the csv has not changed since. The map is copy-on-write, so the
+    frame is writable like a freshly parsed one and edits never reach the sidecar.
+
+    Parameters
+    ----------
+    path: str
+        Path to the csv file
+
+    cache: bool
+        Reads and writes the .npy sidecar
+        Default: True
+
+    Returns
+    -------
+    data: pd.DataFrame
+        Price, Open, High, Low and Change (%) as float64, Volume as int64,
+        indexed by Date in ascending order
+    """
+    assert type(path) == str, 'Invalid Data Type for path'
+
+    sidecar = sidecar_path(path)
+    if cache and sidecar_is_current(path, sidecar):
+        return read_sidecar(sidecar)
+
+    columns = parse_csv(path)
+    if cache:
+        write_sidecar(path, sidecar, columns)
+
+    return to_frame(columns)
+
+
+def parse_csv(path: str) -> dict:
+    """
+    Parses the csv text into a dict of typed numpy arrays sorted by date.
+    """
+    raw = pd.read_csv(path, encoding='utf-8-sig', dtype=str, keep_default_na=False)
+
+    if list(raw.columns) != RAW_COLUMNS:
+        raise ValueError(f'Unexpected columns in {path}: {list(raw.columns)}')
+
+    dates = pd.to_datetime(raw['Date'], format=DATE_FORMAT).to_numpy(dtype='datetime64[ns]').view('int64')
+
+    columns = {'Date': dates}
+    for col in PRICE_COLUMNS:
+        columns[col] = raw[col].str.replace(',', '', regex=False).to_numpy(dtype='float64')
+
+    columns['Volume'] = parse_volume(raw['Vol.'])
+    columns['Change'] = raw['Change %'].str.rstrip('%').str.replace(',', '', regex=False).to_numpy(dtype='float64')
+
+    # exports are newest first
+    order = np.argsort(dates, kind='stable')
+    return {k: np.ascontiguousarray(v[order]) for k, v in columns.items()}
+
+
+def parse_volume(volume: pd.Series) -> np.ndarray:
+    """
+    Converts volume strings such as "621.20K" and "2.66M" to int64. Blank volumes are 0.
+    """
+    volume = volume.str.replace(',', '', regex=False)
+    suffix = volume.str[-1:]
+    multiplier = suffix.map(VOLUME_SUFFIXES).fillna(1).to_numpy(dtype='float64')
+
+    digits = volume.where(~suffix.isin(list(VOLUME_SUFFIXES)), volume.str[:-1])
+    digits = digits.where(digits != '', '0').to_numpy(dtype='float64')
+
+    return np.rint(digits * multiplier).astype('int64')
+
+
+def to_frame(columns: dict) -> pd.DataFrame:
+    index = pd.DatetimeIndex(columns['Date'].view('datetime64[ns]'), name='Date')
+    data = {k: v for k, v in columns.items() if k != 'Date'}
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+def sidecar_path(path: str) -> str:
+    root, _ = os.path.splitext(path)
+    return f'{root}.npy.d'
+
+
+def source_signature(path: str) -> dict:
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def sidecar_is_current(path: str, sidecar: str) -> bool:
+    meta_path = os.path.join(sidecar, 'meta.json')
+    if not os.path.exists(meta_path):
+        return False
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    return meta.get('source') == source_signature(path)
+
+
+def read_sidecar(sidecar: str) -> pd.DataFrame:
+    with open(os.path.join(sidecar, 'meta.json')) as f:
+        meta = json.load(f)
+
+    # copy-on-write: pages are only copied into memory when the frame is modified
+    columns = {col: np.load(os.path.join(sidecar, f'{col}.npy'), mmap_mode='c') for col in meta['columns']}
+    return to_frame(columns)
+
+
+def write_sidecar(path: str, sidecar: str, columns: dict):
+    os.makedirs(sidecar, exist_ok=True)
+    for col, values in columns.items():
+        np.save(os.path.join(sidecar, f'{col}.npy'), values)
+
+    # metadata is written last so a partial sidecar is never treated as current
+    meta = {'columns': list(columns), 'source': source_signature(path)}
+    with open(os.path.join(sidecar, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
@@ -1,11 +1,16 @@
 
 
+import os
 import pandas as pd 
 import numpy as np 
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+
+from performance.instrumentation import instrumented
+
+
+def dataset_rows(result, self):
+    return len(self.dataset)
 
-import statsmodels.tsa.stattools as ts 
-import hurst
-from sklearn import linear_model
 
 class Mean_Reversion:
 
@@ -16,7 +21,10 @@ class Mean_Reversion:
         self.half_life = self.get_half_life()
 
     
+    @instrumented('mean_reversion.get_adf', rows = dataset_rows)
     def get_adf(self):
+        # statsmodels and hurst are imported on first use, they are slow to load 
+        import statsmodels.tsa.stattools as ts 
         test_stat, p_val, _, n, crit_val, _ = ts.adfuller(self.dataset)
 
         confidence = None
@@ -29,37 +37,347 @@ class Mean_Reversion:
             
         return test_stat, p_val, n, crit_val, confidence
 
+    @instrumented('mean_reversion.get_hurst', rows = dataset_rows)
     def get_hurst(self):
+        import hurst
         H,c,data = hurst.compute_Hc(self.dataset, kind = 'price', simplified = True)
         return H
 
-    def get_half_life(self):
-        df_close = self.dataset.to_frame()
-        df_close_1 = df_close.shift(1).dropna()
-        delta = (df_close - df_close_1).dropna()
+    def get_rolling_hurst(self, window: int, step: int = 1, min_window: int = 10):
+        """
+        Hurst exponent over a rolling window, using the same simplified price R/S 
+        method as get_hurst (hurst.compute_Hc with kind = 'price').
+
+        The R/S of every chunk is computed once for the whole series and shared by 
+        all windows containing that chunk, instead of calling compute_Hc per window.
+
+        Parameters
+        ----------
+        window: int
+            Number of prices in each window. Must be at least 100
+
+        step: int
+            Number of bars between windows
+            Default: 1
+
+        min_window: int
+            Smallest chunk size of the R/S analysis
+            Default: 10
+
+        Returns
+        -------
+        hurst: pd.Series
+            Hurst exponent at the last bar of each window
+        """
+        assert type(window) == int, 'Invalid Data Type for window'
+        assert type(step) == int, 'Invalid Data Type for step'
+
+        close = pd.Series(self.dataset).astype('float64')
+        if window < 100:
+            raise ValueError('Window must be at least 100')
+        if window > len(close):
+            raise ValueError('Window is longer than the dataset')
+        if step < 1:
+            raise ValueError('Step must be at least 1')
+
+        starts = np.arange(0, len(close) - window + 1, step)
+        sizes = hurst_chunk_sizes(window, min_window)
+
+        log_rs = np.empty((len(starts), len(sizes)))
+        for j, size in enumerate(sizes):
+            # chunks of each window begin at its start and every size bars after
+            total, count = strided_window_sums(chunk_rs(close, size), size, window // size, starts)
+            with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                log_rs[:, j] = np.log10(total / count)
+
+        log_sizes = np.broadcast_to(np.log10(sizes), log_rs.shape)
+        H = regression_slope(log_sizes, log_rs)
+
+        return pd.Series(H, index = close.index[starts + window - 1], name = 'hurst')
+
+    def get_expanding_hurst(self, min_periods: int = 100, step: int = 1, min_window: int = 10):
+        """
+        Hurst exponent over an expanding window from the start of the dataset, 
+        matching hurst.compute_Hc(kind = 'price') on each window in one O(n) pass 
+        per chunk size.
+
+        Parameters
+        ----------
+        min_periods: int
+            Number of prices in the first window. Must be at least 100
+
+        step: int
+            Number of bars between windows
+            Default: 1
+
+        min_window: int
+            Smallest chunk size of the R/S analysis
+            Default: 10
+
+        Returns
+        -------
+        hurst: pd.Series
+            Hurst exponent at the last bar of each window
+        """
+        assert type(min_periods) == int, 'Invalid Data Type for min_periods'
+        assert type(step) == int, 'Invalid Data Type for step'
+
+        close = pd.Series(self.dataset).astype('float64')
+        if min_periods < 100:
+            raise ValueError('min_periods must be at least 100')
+        if min_periods > len(close):
+            raise ValueError('min_periods is longer than the dataset')
+        if step < 1:
+            raise ValueError('Step must be at least 1')
 
-        model = linear_model.LinearRegression()
+        lengths = np.arange(min_periods, len(close) + 1, step)
 
-        delta = delta.values.reshape(len(delta), 1)
-        df_close_1 = df_close_1.values.reshape(len(df_close_1), 1)
+        # number of grid chunk sizes used by compute_Hc for each window length
+        num_sizes = np.ceil((np.log10(lengths - 1) - np.log10(min_window)) / 0.25).astype(int)
+        sizes = hurst_chunk_sizes(len(close), min_window)
 
-        model.fit(df_close_1, delta)
+        log_sizes = np.full((len(lengths), len(sizes) + 1), np.nan)
+        log_rs = np.full((len(lengths), len(sizes) + 1), np.nan)
 
-        coef = model.coef_.item()
+        for j, size in enumerate(sizes):
+            used = num_sizes > j
+            if not used.any():
+                break
+
+            # running mean of the non-zero R/S of the chunks starting at multiples of size
+            rs = chunk_rs(close, size)[0:len(close) - size + 1:size]
+            total = np.cumsum(rs)
+            count = np.cumsum(rs != 0)
+
+            last = lengths[used] // size - 1
+            with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                log_rs[used, j] = np.log10(total[last] / count[last])
+            log_sizes[used, j] = np.log10(size)
+
+        # the whole window is always the last chunk size
+        pct = close.pct_change()
+        full_range = close.expanding().max() / close.expanding().min() - 1
+        full_sdev = pct.expanding().std()
+        full_rs = (full_range / full_sdev).where((full_range != 0) & (full_sdev != 0)).to_numpy()
+
+        log_rs[:, -1] = np.log10(full_rs[lengths - 1])
+        log_sizes[:, -1] = np.log10(lengths)
+
+        H = regression_slope(log_sizes, log_rs)
+
+        return pd.Series(H, index = close.index[lengths - 1], name = 'hurst')
+
+    @instrumented('mean_reversion.get_half_life', rows = dataset_rows)
+    def get_half_life(self):
+        close = np.asarray(self.dataset, dtype = 'float64')
+
+        # regress the change in price on the previous price
+        lagged = close[:-1]
+        delta = np.diff(close)
+
+        lagged_dev = lagged - lagged.mean()
+        coef = (lagged_dev * (delta - delta.mean())).sum() / (lagged_dev * lagged_dev).sum()
 
         half_life = -np.log(2) / coef 
         return half_life
+
+    def get_rolling_half_life(self, window: int):
+        """
+        Half-life over a rolling window of bars
+
+        Uses the rolling covariance and variance of the lagged price against its change,
+        which pandas updates incrementally, so the cost is O(n) regardless of window.
+
+        Parameters
+        ----------
+        window: int
+            Number of price changes in each regression
+
+        Returns
+        -------
+        half_life: pd.Series
+            Half-life at the end of each window, aligned to the dataset index
+        """
+        assert type(window) == int, 'Invalid Data Type for window'
+
+        if window < 2:
+            raise ValueError('Window must be at least 2')
+
+        close = pd.Series(self.dataset).astype('float64')
+        lagged = close.shift(1)
+        delta = close - lagged
+
+        rolling = lagged.rolling(window)
+        coef = rolling.cov(delta) / rolling.var()
+
+        half_life = -np.log(2) / coef
+        half_life.name = 'half_life'
+        return half_life
     
-    def summary(self):
-        
-        items = {
+    def metrics(self):
+
+        return {
             'test_statistic' : self.test_statistic,
             'confidence': self.confidence,
             'p_value' : self.p_value,
             'hurst' : self.hurst, 
             'half_life' : self.half_life
         }
+    
+    def summary(self):
+        
+        items = self.metrics()
 
         df = pd.DataFrame.from_dict(items, orient = 'index')
         df.columns = ['Value']
         return df
+
+
+def hurst_chunk_sizes(length: int, min_window: int = 10):
+    """
+    Chunk sizes used by hurst.compute_Hc for a series of the given length.
+    """
+    sizes = [int(10**x) for x in np.arange(np.log10(min_window), np.log10(length - 1), 0.25)]
+    return np.array(sizes + [length])
+
+
+def chunk_rs(close: pd.Series, size: int):
+    """
+    Simplified price R/S of the chunk of size prices starting at every bar, as in
+    hurst.compute_Hc. Chunks with an undefined ratio are 0 and chunks running past
+    the end of the series are NaN.
+    """
+    price_range = close.rolling(size).max() / close.rolling(size).min() - 1
+
+    # a chunk of size prices holds size - 1 percent changes
+    sdev = close.pct_change().rolling(size - 1).std()
+
+    rs = (price_range / sdev).where((price_range != 0) & (sdev != 0), 0)
+
+    # shift from the chunk's last bar to its first bar
+    rs = rs.to_numpy()[size - 1:]
+    return np.concatenate([rs, np.full(size - 1, np.nan)])
+
+
+def strided_window_sums(rs: np.ndarray, size: int, num_chunks: int, starts: np.ndarray):
+    """
+    Sum and non-zero count of rs[start + size * k] for k < num_chunks at every start.
+
+    Values one size apart share a residue mod size, so each residue class gets its
+    own running sum and every window is a difference of two of them. Uses O(n)
+    memory whatever the number of chunks per window.
+    """
+    rows = -(-len(rs) // size)
+    padded = np.zeros(rows * size)
+    padded[:len(rs)] = rs
+
+    # row q, column r holds rs[q * size + r]
+    grid = padded.reshape(rows, size)
+    total = np.vstack([np.zeros((1, size)), np.cumsum(grid, axis = 0)])
+    count = np.vstack([np.zeros((1, size), dtype = 'int64'), np.cumsum(grid != 0, axis = 0)])
+
+    q, r = starts // size, starts % size
+    return total[q + num_chunks, r] - total[q, r], count[q + num_chunks, r] - count[q, r]
+
+
+def regression_slope(x, y):
+    """
+    Slope of a least squares fit of y on x for every row, ignoring NaN pairs.
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x = np.where(valid, x, np.nan)
+    y = np.where(valid, y, np.nan)
+
+    x_dev = x - np.nanmean(x, axis = 1, keepdims = True)
+    y_dev = y - np.nanmean(y, axis = 1, keepdims = True)
+    return np.nansum(x_dev * y_dev, axis = 1) / np.nansum(x_dev * x_dev, axis = 1)
+
+
+def summarize(item):
+    """
+    Computes the summary metrics of one (name, series) pair. Runs in the worker processes.
+    Errors are reported per series so one bad symbol does not stop a scan.
+    """
+    name, series = item
+    try:
+        row = Mean_Reversion(series.dropna()).metrics()
+        row['error'] = None
+    except Exception as e:
+        row = {'error' : f'{type(e).__name__}: {e}'}
+    return name, row
+
+
+def iter_items(data):
+    if isinstance(data, pd.DataFrame):
+        for name in data.columns:
+            yield name, data[name]
+        return
+
+    for i, item in enumerate(data):
+        if isinstance(item, pd.Series):
+            yield (item.name if item.name is not None else i), item
+        else:
+            yield item
+
+
+def iter_screen(data, max_workers = None, max_pending = None):
+    """
+    Screens many series for mean reversion across a process pool.
+
+    Yields (name, metrics) as results complete. Input is consumed lazily with 
+    at most max_pending series in flight, so long iterators are not held in memory.
+
+    Parameters
+    ----------
+    data: pd.DataFrame or iterable
+        A panel with one column per symbol, or an iterable of named series 
+        or (name, series) pairs
+
+    max_workers: int
+        Number of worker processes. Default: number of cores
+
+    max_pending: int
+        Maximum number of submitted series. Default: 4 per worker
+    """
+    max_workers = os.cpu_count() if max_workers is None else max_workers
+    max_pending = 4 * max_workers if max_pending is None else max_pending
+
+    items = iter_items(data)
+    with ProcessPoolExecutor(max_workers = max_workers) as executor:
+        pending = set()
+        for item in items:
+            pending.add(executor.submit(summarize, item))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when = FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        for future in as_completed(pending):
+            yield future.result()
+
+
+def screen(data, max_workers = None, max_pending = None):
+    """
+    Computes the Mean_Reversion summary metrics for many series in parallel.
+
+    Parameters
+    ----------
+    data: pd.DataFrame or iterable
+        A panel with one column per symbol, or an iterable of named series 
+        or (name, series) pairs
+
+    max_workers: int
+        Number of worker processes. Default: number of cores
+
+    max_pending: int
+        Maximum number of submitted series. Default: 4 per worker
+
+    Returns
+    -------
+    results: pd.DataFrame
+        One row per series with test_statistic, confidence, p_value, hurst, 
+        half_life and error
+    """
+    results = dict(iter_screen(data, max_workers, max_pending))
+    columns = ['test_statistic', 'confidence', 'p_value', 'hurst', 'half_life', 'error']
+    return pd.DataFrame.from_dict(results, orient = 'index', columns = columns)
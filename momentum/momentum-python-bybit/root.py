@@ -1,5 +1,19 @@
+import os 
+import sys 
+import json 
+import argparse 
+from itertools import product 
+
+# spread_momentum imports the shared performance package from the repository root 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 import spread_momentum as sm 
 
+STORE = None 
+SOURCE = None 
+
+# resolutions offered in the prompt, derived locally from hourly candles 
+RESOLUTIONS = ['60', '240', 'D', 'W']
+
 class Generic: 
 
     def __init__(self):
@@ -143,17 +157,34 @@ class MomentumTrade(Generic):
         self.zscore_threshold = self.get_zscore_threshold()
 
         #self.strategy = self.generate()
-        self.strategy = sm.SpreadMomentum(self.symbol, self.resolution, self.zscore_period, self.zscore_threshold)
+        self.strategy = sm.SpreadMomentum(self.symbol, self.resolution, self.zscore_period, self.zscore_threshold, store=self.get_source())
+
+    @staticmethod 
+    def get_store() -> sm.CandleStore:
+        # Candles are cached locally so new configs only fetch the latest bars 
+        global STORE 
+        if STORE is None:
+            STORE = sm.CandleStore(directory="candles")
+        return STORE 
+
+    @staticmethod 
+    def get_source() -> sm.Resampler: 
+        # Only hourly candles are downloaded, other resolutions are resampled from them. 
+        # The first run of a symbol downloads its hourly history once, later runs only the newest bars 
+        global SOURCE 
+        if SOURCE is None: 
+            SOURCE = sm.Resampler(MomentumTrade.get_store(), base='60')
+        return SOURCE 
 
     def get_symbol(self): 
         # gets string input 
         # temporary 
-        available_symbols=sm.ByBitTrader().available_symbols 
+        available_symbols=self.get_store().trader.available_symbols 
         print("Select Symbol")
         value = self.get_string_value(
             "Symbol", 
             default=available_symbols[0], 
-            valid_values=sm.ByBitTrader().available_symbols,
+            valid_values=available_symbols,
             show_exit=True        
         )
 
@@ -161,10 +192,14 @@ class MomentumTrade(Generic):
         
 
     def get_resolution(self):
-        # create a dict of resolutions to map readable inputs to bybit format 
-        # temporary 
-        resolution = 'D'
-        return resolution 
+        # bybit kline intervals 
+        print("Select Resolution")
+        value = self.get_string_value(
+            "Resolution", 
+            default='D', 
+            valid_values=RESOLUTIONS 
+        )
+        return 'D' if value is None else value 
     
     def get_zscore_period(self) -> int:
         # integer input 
@@ -221,7 +256,49 @@ class MomentumTrade(Generic):
         print()  
         
 
+def parse_args(argv=None): 
+    parser = argparse.ArgumentParser(description="Spread momentum signals. Runs interactively without arguments.")
+    parser.add_argument("--config", help="JSON file with symbols, resolution, periods and thresholds")
+    parser.add_argument("--symbols", nargs="+", help="Symbols to run, or 'all' for every inverse symbol")
+    parser.add_argument("--resolution", help="Bybit kline interval [D]")
+    parser.add_argument("--periods", nargs="+", type=int, help="Z-Score periods [10]")
+    parser.add_argument("--thresholds", nargs="+", type=float, help="Z-Score thresholds [1]")
+    parser.add_argument("--output", help="Write the signal table to this csv instead of printing it")
+    parser.add_argument("--workers", type=int, default=16, help="Symbols fetched at a time [16]")
+    return parser.parse_args(argv)
+
+
+def run_batch(args): 
+    # command line values override the config file 
+    config = {} 
+    if args.config is not None: 
+        with open(args.config) as f: 
+            config = json.load(f)
+
+    symbols = args.symbols or config.get("symbols")
+    if not symbols: 
+        raise ValueError("Error. No symbols given.")
+    resolution = args.resolution or config.get("resolution", "D")
+    periods = args.periods or config.get("periods", [10])
+    thresholds = args.thresholds or config.get("thresholds", [1])
+
+    runner = sm.SignalRunner(store=MomentumTrade.get_source(), max_workers=args.workers)
+    signals = runner.run(symbols, list(product(periods, thresholds)), resolution)
+
+    if args.output is not None: 
+        signals.to_csv(args.output, index=False)
+        print(f"Wrote {len(signals)} signals to {args.output}")
+    else: 
+        print(signals.to_string(index=False))
+    return signals 
+
+
 if __name__ == "__main__": 
+    args = parse_args()
+    if args.config is not None or args.symbols is not None: 
+        run_batch(args)
+        sys.exit(0)
+
     ## generate trade parameters here 
     ## Add option in loop to modify current configuration 
     print("============================")
@@ -1,3 +1,8 @@
 from .bybit_trader import * 
+from .candle_store import * 
 from .strategy import *
-from .plots import *
\ No newline at end of file
+from .sweep import *
+from .online import *
+from .plots import *
+from .runner import *
+from .resampler import *
@@ -1,48 +1,140 @@
-import pybit
+import threading
 import pandas as pd 
 from datetime import datetime as dt 
-from pybit.unified_trading import HTTP
+from concurrent.futures import ThreadPoolExecutor
+from performance.instrumentation import instrumented
 
 
+# Bybit kline intervals in ms. Monthly candles use the longest month so a 
+# planned window never holds more candles than the page limit. 
+INTERVAL_MS = {
+    '1': 60_000, 
+    '3': 3 * 60_000, 
+    '5': 5 * 60_000, 
+    '15': 15 * 60_000, 
+    '30': 30 * 60_000, 
+    '60': 60 * 60_000, 
+    '120': 120 * 60_000, 
+    '240': 240 * 60_000, 
+    '360': 360 * 60_000, 
+    '720': 720 * 60_000, 
+    'D': 86_400_000, 
+    'W': 7 * 86_400_000, 
+    'M': 31 * 86_400_000
+}
+
+KLINE_LIMIT = 1000 
+KLINE_COLUMNS = ['Date','Open','High','Low','Close','Volume','Turnover']
+
 
 class ByBitTrader:
 
-    def __init__(self):
-        self.session = HTTP(testnet=False)
-        self.available_symbols = self.get_all_symbols()
+    def __init__(self, session=None, max_workers:int=8, pool_size:int=32):
+        # session can be any object exposing the pybit HTTP market endpoints. 
+        # The pybit session and the symbol list are only created on first use. 
+        # pool_size is the number of connections kept open for concurrent requests. 
+        self.http_session = session
+        self.max_workers = max_workers
+        self.pool_size = pool_size
+        self.symbols = None
+        self.session_lock = threading.Lock()
         #self.available_symbols = ['BTCUSD','ETHUSD','XRPUSD'] # temporary
 
-    def get_historical_data(self, symbol:str, interval:str, start_date:dt, end_date:dt) -> pd.DataFrame:
-  
-        
+    @property 
+    def session(self):
+        # page and symbol fetches ask for the session from worker threads, so it is 
+        # created under a lock and only published once its pool is mounted 
+        if self.http_session is None:
+            with self.session_lock:
+                if self.http_session is None:
+                    from pybit.unified_trading import HTTP
+                    session = HTTP(testnet=False)
+                    self.pool_connections(session)
+                    self.http_session = session
+        return self.http_session
+
+    def pool_connections(self, session):
+        # pybit sends every request through one requests.Session (client). Its default 
+        # pool keeps 10 connections, fewer than the concurrent page and symbol fetches. 
+        client = getattr(session, 'client', None)
+        if client is None:
+            return 
+        from requests.adapters import HTTPAdapter
+        client.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size))
+
+    def resize_pool(self, pool_size:int):
+        # callers running several get_historical_data at once (SignalRunner) need a 
+        # connection per page fetch of every call, or requests wait for a free one 
+        with self.session_lock:
+            if pool_size <= self.pool_size:
+                return 
+            self.pool_size = pool_size
+            if self.http_session is not None:
+                self.pool_connections(self.http_session)
+
+    @property 
+    def available_symbols(self) -> list:
+        if self.symbols is None:
+            self.symbols = self.get_all_symbols()
+        return self.symbols
+
+    @instrumented('bybit.get_historical_data')
+    def get_historical_data(self, symbol:str, interval:str, start_date:dt, end_date:dt, category:str="inverse") -> pd.DataFrame:
+
+        if start_date > end_date:
+            raise ValueError("Error. Start date cannot be greater than end date.")
+
         # timestamps have to be in ms 
         start_date_ts = int(start_date.timestamp()*1000)
         end_date_ts = int(end_date.timestamp()*1000)
 
-        if start_date > end_date:
-            raise ValueError("Error. Start date cannot be greater than end date.")
+        windows = self.plan_windows(interval, start_date_ts, end_date_ts)
 
-        result = self.session.get_kline(category="inverse", symbol=symbol, interval=interval, start=start_date_ts, end = end_date_ts, limit=1000)
-        json_result = result['result']['list']
+        def fetch(window):
+            return self.get_kline_page(symbol, interval, window[0], window[1], category)
 
-        df = self.parse_json_result(json_result)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pages = list(executor.map(fetch, windows))
 
-        # recursion base case 
-        if len(df) <= 1: 
-            return df 
-        
-        first_date = df[:1].index.item()
-        
-        if start_date < first_date: 
-            prev = self.get_historical_data(symbol, interval, start_date, first_date)
-            return pd.concat([prev, df]).drop_duplicates(keep='first')
-            
-        return df.drop_duplicates(keep='first')
+        # pages are newest first, as returned by the api, so the combined rows 
+        # keep the ordering expected by parse_json_result 
+        rows = [row for page in reversed(pages) for row in page]
+
+        df = self.parse_json_result(rows)
+        return df[~df.index.duplicated(keep='first')]
+
+    @staticmethod 
+    def plan_windows(interval:str, start_ts:int, end_ts:int, limit:int=KLINE_LIMIT) -> list:
+        """
+        Splits a time range into non-overlapping request windows 
+
+        Parameters
+        ----------
+            interval: str 
+                bybit kline interval 
+
+            start_ts: int 
+                start of range in ms 
+
+            end_ts: int 
+                end of range in ms 
+
+            limit: int 
+                maximum number of candles per request
+        """
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Error. Unsupported interval: {interval}")
+
+        span = INTERVAL_MS[interval] * limit 
+        return [(ts, min(ts + span - 1, end_ts)) for ts in range(start_ts, end_ts + 1, span)]
+
+    def get_kline_page(self, symbol:str, interval:str, start_ts:int, end_ts:int, category:str="inverse") -> list:
+        result = self.session.get_kline(category=category, symbol=symbol, interval=interval, start=start_ts, end=end_ts, limit=KLINE_LIMIT)
+        return result['result']['list']
 
     @staticmethod 
     def parse_json_result(result) -> pd.DataFrame:
-        df = pd.DataFrame(result)
-        df.columns=['Date','Open','High','Low','Close','Volume','Turnover']
+        df = pd.DataFrame(result, columns=KLINE_COLUMNS)
         df = df.set_index('Date', drop=True)
         df.index = pd.to_datetime(df.index.astype('int64'), unit='ms')
         df = df[::-1]
@@ -0,0 +1,134 @@
+import os
+import pandas as pd
+import numpy as np
+from datetime import datetime as dt
+from .bybit_trader import ByBitTrader, INTERVAL_MS
+from performance.instrumentation import instrumented
+
+
+class CandleStore:
+    """
+    Persistent on-disk candle cache in front of ByBitTrader.get_historical_data
+
+    Candles are stored per (category, symbol, interval). Only candles newer than
+    the last cached bar, older than the first cached bar, or missing inside the
+    cached range are requested from the api.
+    """
+
+    def __init__(self, trader:ByBitTrader=None, directory:str="candles"):
+        self.trader = ByBitTrader() if trader is None else trader
+        self.directory = directory
+
+    def path(self, category:str, symbol:str, interval:str) -> str:
+        return os.path.join(self.directory, category, symbol, f"{interval}.pkl")
+
+    def load(self, category:str, symbol:str, interval:str) -> dict:
+        path = self.path(category, symbol, interval)
+        if not os.path.exists(path):
+            return None
+        return pd.read_pickle(path)
+
+    def save(self, category:str, symbol:str, interval:str, entry:dict):
+        path = self.path(category, symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # write then rename so an interrupted run never leaves a truncated cache
+        tmp = f"{path}.tmp"
+        pd.to_pickle(entry, tmp)
+        os.replace(tmp, path)
+
+    @instrumented('candle_store.get_historical_data')
+    def get_historical_data(self, symbol:str, interval:str, start_date:dt, end_date:dt, category:str="inverse") -> pd.DataFrame:
+
+        if start_date > end_date:
+            raise ValueError("Error. Start date cannot be greater than end date.")
+
+        start_ts = int(start_date.timestamp()*1000)
+        end_ts = int(end_date.timestamp()*1000)
+
+        entry = self.load(category, symbol, interval)
+        if entry is None:
+            entry = {'candles': None, 'verified_gaps': []}
+
+        ranges = self.missing_ranges(entry, interval, start_ts, end_ts)
+        if len(ranges) > 0:
+            entry = self.update(entry, symbol, interval, ranges, category)
+            self.save(category, symbol, interval, entry)
+
+        candles = entry['candles']
+        if candles is None:
+            return ByBitTrader.parse_json_result([])
+        return candles.loc[(candles.index >= self.to_index(start_ts)) & (candles.index <= self.to_index(end_ts))]
+
+    def missing_ranges(self, entry:dict, interval:str, start_ts:int, end_ts:int) -> list:
+        """
+        Lists the (start, end, gap key) ms ranges that are not yet covered by the cache.
+
+        The gap key identifies a hole that can be marked as verified if the api 
+        returns nothing for it. Ranges at the live end of the cache have no key.
+        """
+        candles = entry['candles']
+        if candles is None or len(candles) == 0:
+            return [(start_ts, end_ts, None)]
+
+        step = INTERVAL_MS[interval]
+        cached_ts = self.to_timestamps(candles.index)
+        first_ts, last_ts = cached_ts[0], cached_ts[-1]
+
+        ranges = []
+        if start_ts < first_ts and first_ts not in entry['verified_gaps']:
+            ranges.append((start_ts, first_ts - 1, first_ts))
+
+        # gaps inside the cached range, skipping ones the api already confirmed empty
+        gaps = np.flatnonzero(np.diff(cached_ts) > step)
+        for i in gaps:
+            gap_start = cached_ts[i] + step
+            if gap_start in entry['verified_gaps']:
+                continue
+            if cached_ts[i+1] - 1 < start_ts or gap_start > end_ts:
+                continue
+            ranges.append((gap_start, cached_ts[i+1] - 1, gap_start))
+
+        # the last cached bar is refetched since it may still have been forming
+        if end_ts >= last_ts:
+            ranges.append((last_ts, end_ts, None))
+
+        return ranges
+
+    def update(self, entry:dict, symbol:str, interval:str, ranges:list, category:str) -> dict:
+        frames = [] if entry['candles'] is None else [entry['candles']]
+        verified_gaps = list(entry['verified_gaps'])
+
+        for range_start, range_end, gap_key in ranges:
+            fetched = self.trader.get_historical_data(symbol, interval, self.from_timestamp(range_start), self.from_timestamp(range_end), category)
+            if len(fetched) == 0:
+                # nothing traded in this hole, do not ask for it again
+                if gap_key is not None:
+                    verified_gaps.append(int(gap_key))
+                continue
+            if entry['candles'] is None:
+                # the first download already covered everything before its first bar
+                verified_gaps.append(int(self.to_timestamps(fetched.index)[0]))
+            frames.append(fetched)
+
+        if len(frames) == 0:
+            return {'candles': entry['candles'], 'verified_gaps': verified_gaps}
+
+        # newer fetches win over cached rows for the same bar
+        candles = pd.concat(frames)
+        candles = candles[~candles.index.duplicated(keep='last')].sort_index()
+        return {'candles': candles, 'verified_gaps': verified_gaps}
+
+
+    @staticmethod 
+    def to_timestamps(index:pd.DatetimeIndex) -> np.ndarray:
+        return ((index - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)).to_numpy(dtype='int64')
+
+    @staticmethod 
+    def to_index(ts:int) -> pd.Timestamp:
+        return pd.Timestamp(ts, unit='ms')
+
+    @staticmethod 
+    def from_timestamp(ts:int) -> dt:
+        # naive local time, matching how ByBitTrader converts dates to ms 
+        return dt.fromtimestamp(ts / 1000)
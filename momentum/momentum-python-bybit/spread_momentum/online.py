@@ -0,0 +1,184 @@
+import json
+import numpy as np
+import pandas as pd
+
+
+class OnlineSpreadMomentum:
+    """
+    Incremental version of SpreadMomentum.build_signal
+
+    Keeps the running EWM and position state so each new bar updates the signal
+    in O(1). The updates follow the pandas ewm recurrences (adjust=True,
+    bias=False) so the output matches build_signal on the same data.
+
+    The state is a plain dict and can be saved to json and resumed later
+    without replaying the history.
+    """
+
+    def __init__(self, spread_period:int=10, z_threshold:int=1, state:dict=None):
+        self.spread_period = spread_period
+        self.z_threshold = z_threshold
+
+        # weight decay per bar for span based ewm
+        self.decay = 1 - 2 / (spread_period + 1)
+
+        self.state = self.initial_state() if state is None else dict(state)
+
+    @staticmethod
+    def initial_state() -> dict:
+        return {
+            'last_date': None,
+            'last_close': None,
+            'nobs': 0,
+            # ewm mean of close
+            'mean': None,
+            'mean_wt': 1.0,
+            # ewm mean of the spread
+            'spread_mean': None,
+            'spread_mean_wt': 1.0,
+            # ewm variance of the spread
+            'var_mean': None,
+            'var_cov': 0.0,
+            'var_sum_wt': 1.0,
+            'var_sum_wt2': 1.0,
+            'var_old_wt': 1.0,
+            # positions
+            'long_pos': 0.0,
+            'short_pos': 0.0,
+            'next_day_position': None
+        }
+
+    def ewm_mean(self, value:float, key:str) -> float:
+        # pandas ewm mean recurrence with adjust=True
+        weighted = self.state[key]
+        if weighted is None:
+            self.state[key] = value
+            return value
+
+        old_wt = self.state[f'{key}_wt'] * self.decay
+        if weighted != value:
+            weighted = (old_wt * weighted + value) / (old_wt + 1)
+        self.state[key] = weighted
+        self.state[f'{key}_wt'] = old_wt + 1
+        return weighted
+
+    def ewm_std(self, value:float) -> float:
+        # pandas ewm covariance recurrence with adjust=True, bias=False
+        s = self.state
+        if s['var_mean'] is None:
+            s['var_mean'] = value
+        else:
+            s['var_sum_wt'] *= self.decay
+            s['var_sum_wt2'] *= self.decay * self.decay
+            s['var_old_wt'] *= self.decay
+
+            old_wt = s['var_old_wt']
+            old_mean = s['var_mean']
+            mean = old_mean
+            if mean != value:
+                mean = (old_wt * old_mean + value) / (old_wt + 1)
+
+            s['var_cov'] = (old_wt * (s['var_cov'] + (old_mean - mean) ** 2) + (value - mean) ** 2) / (old_wt + 1)
+            s['var_mean'] = mean
+            s['var_sum_wt'] += 1
+            s['var_sum_wt2'] += 1
+            s['var_old_wt'] += 1
+
+        numerator = s['var_sum_wt'] * s['var_sum_wt']
+        denominator = numerator - s['var_sum_wt2']
+        if denominator <= 0:
+            return np.nan
+
+        var = (numerator / denominator) * s['var_cov']
+        return np.sqrt(var) if var > 0 else 0.0
+
+    def update(self, close:float, date=None) -> dict:
+        """
+        Adds one bar and returns the build_signal columns for it
+
+        Parameters
+        ----------
+            close: float
+                close price of the new bar
+
+            date: any
+                optional bar timestamp, bars at or before the last one are rejected
+        """
+        s = self.state
+        close = float(close)
+
+        if date is not None and s['last_date'] is not None and pd.Timestamp(date) <= pd.Timestamp(s['last_date']):
+            raise ValueError(f"Failed to update signal. Bar {date} is not newer than {s['last_date']}.")
+
+        log_return = np.nan if s['last_close'] is None else np.log(close / s['last_close'])
+
+        mean = self.ewm_mean(close, 'mean')
+        spread = close - mean
+        spread_mean = self.ewm_mean(spread, 'spread_mean')
+        spread_sdev = self.ewm_std(spread)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_score = np.float64(spread - spread_mean) / spread_sdev
+
+        # same entry and exit conditions as build_signal, exits win ties
+        if not np.isnan(z_score):
+            if z_score <= 0:
+                s['long_pos'] = 0.0
+            elif z_score >= self.z_threshold:
+                s['long_pos'] = 1.0
+
+            if z_score >= 0:
+                s['short_pos'] = 0.0
+            elif z_score <= -self.z_threshold:
+                s['short_pos'] = -1.0
+
+        # Signal used for backtesting is yesterday's next day position
+        signal = np.nan if s['next_day_position'] is None else s['next_day_position']
+        next_day_position = s['long_pos'] + s['short_pos']
+
+        s['next_day_position'] = next_day_position
+        s['last_close'] = close
+        s['last_date'] = None if date is None else str(pd.Timestamp(date))
+        s['nobs'] += 1
+
+        return {
+            'Close': close,
+            'log_returns': log_return,
+            'mean': mean,
+            'spread': spread,
+            'spread_mean': spread_mean,
+            'spread_sdev': spread_sdev,
+            'z_score': z_score,
+            'z_upper': self.z_threshold,
+            'z_lower': -self.z_threshold,
+            'long_pos': s['long_pos'],
+            'short_pos': s['short_pos'],
+            'next_day_position': next_day_position,
+            'signal': signal
+        }
+
+    def run(self, close:pd.Series) -> pd.DataFrame:
+        """
+        Feeds a series of closes through update and returns one row per bar
+        """
+        rows = [self.update(value, date) for date, value in close.items()]
+        return pd.DataFrame(rows, index=close.index)
+
+    def to_dict(self) -> dict:
+        return {
+            'spread_period': self.spread_period,
+            'z_threshold': self.z_threshold,
+            'state': self.state
+        }
+
+    @classmethod
+    def from_dict(cls, data:dict):
+        return cls(data['spread_period'], data['z_threshold'], state=data['state'])
+
+    def save(self, path:str):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path:str):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
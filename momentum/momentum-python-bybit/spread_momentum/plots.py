@@ -1,6 +1,12 @@
-import matplotlib.pyplot as plt 
-import mplfinance as mpf 
 import pandas as pd 
+from performance.metrics import annual_returns, performance_summary
+
+
+# matplotlib and mplfinance are imported on first plot so headless signal 
+# generation does not pay for them 
+def get_pyplot():
+    import matplotlib.pyplot as plt 
+    return plt 
 
 
 class Plots:
@@ -13,6 +19,7 @@ class Plots:
         self.returns = self.generate_returns_df(self.data)
 
     def plot_z_score(self):
+        plt = get_pyplot()
         try:
             data = self.data.copy()
         except AttributeError as a:
@@ -27,10 +34,13 @@ class Plots:
         plt.show()
 
     def plot_ohlc(self):
+        plt = get_pyplot()
+        import mplfinance as mpf 
         mpf.plot(self.data.tail(100), figsize=(12, 6), title=f"{self.symbol} Price - Last 100 Candles", type='candle')
         plt.show()
 
     def plot_backtest(self): 
+        plt = get_pyplot()
         data = self.data.copy()
         
         # signal is already shifted
@@ -42,13 +52,15 @@ class Plots:
         plt.show()
 
     def plot_buy_and_hold_comparison(self):
+        plt = get_pyplot()
         self.returns.cumsum().plot(figsize=(12, 6))
         plt.ylabel('Log Returns')
         plt.title('Benchmark vs Strategy Returns')
         plt.show()
 
     def plot_annual_returns_comparison(self):
-        ann_returns = self.returns.groupby(self.returns.index.year).sum() 
+        plt = get_pyplot()
+        ann_returns = annual_returns(self.returns, kind='log')
         
         strategy_annual = ann_returns['Strategy'].mean() * 100 
         benchmark_annual = ann_returns['Benchmark'].mean() * 100 
@@ -61,6 +73,18 @@ class Plots:
         plt.title('Annual Returns Comparison: Benchmark vs Strategy')
         plt.show()
 
+    def summary(self, periods_per_year:float=None):
+        # Sharpe, Sortino, drawdown and CAGR of the benchmark and strategy
+        return performance_summary(self.returns, kind='log', periods_per_year=periods_per_year)
+
+    def report_job(self) -> dict:
+        # returns and z-score for performance.render_reports batch rendering
+        return {
+            'name': self.symbol,
+            'returns': self.returns,
+            'kind': 'log',
+            'series': {'z_score': self.data['z_score']}
+        }
 
     @staticmethod 
     def generate_returns_df(data):
@@ -0,0 +1,160 @@
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime as dt
+from .bybit_trader import INTERVAL_MS, KLINE_COLUMNS
+from .candle_store import CandleStore
+from .strategy import HISTORY_START
+
+
+# Monday 1970-01-05, bybit weekly candles open on Mondays (UTC)
+WEEK_ORIGIN_MS = 4 * 86_400_000
+
+
+class Resampler:
+    """
+    Derives coarser candles from one cached base resolution per symbol
+
+    Only the base interval is downloaded, through the candle store. Every other
+    interval that is a whole number of base candles (and D, W, M from hourly or
+    finer bases) is aggregated locally: Open first, High max, Low min, Close last,
+    Volume and Turnover summed, labelled by bar open time like the bybit api.
+
+    The first derived request of a symbol downloads its full base history once,
+    about a hundred hourly pages per symbol, into the candle store. Every later
+    request, for any derivable interval, only fetches the newest base candles.
+
+    Derived candles are kept in memory and only the last, possibly still forming,
+    bar is rebuilt when new base candles arrive. Has the same get_historical_data
+    and trader as CandleStore, so it can be passed as store to SpreadMomentum.
+
+    Base candles fetched in the last max_age seconds are reused, so requesting
+    several intervals of a symbol in one run updates the base only once.
+    """
+
+    def __init__(self, store:CandleStore=None, base:str='60', max_age:float=60):
+        if base not in INTERVAL_MS or base in ['D', 'W', 'M']:
+            raise ValueError(f"Error. Unsupported base interval: {base}")
+
+        self.store = CandleStore() if store is None else store
+        self.base = base
+        self.max_age = max_age
+        # (category, symbol) -> (fetch time, base candles)
+        self.bases = {}
+        # (category, symbol, interval) -> {'candles', 'base_rows', 'last_start'}
+        self.derived = {}
+
+    @property
+    def trader(self):
+        return self.store.trader
+
+    def can_derive(self, interval:str) -> bool:
+        if interval in ['D', 'W', 'M']:
+            return 86_400_000 % INTERVAL_MS[self.base] == 0
+        return interval in INTERVAL_MS and INTERVAL_MS[interval] > INTERVAL_MS[self.base] and INTERVAL_MS[interval] % INTERVAL_MS[self.base] == 0
+
+    def get_historical_data(self, symbol:str, interval:str, start_date:dt, end_date:dt, category:str="inverse") -> pd.DataFrame:
+        # the base itself and intervals that cannot be built from it go to the store,
+        # everything else fills the base history first if it is not cached yet
+        if interval == self.base or not self.can_derive(interval):
+            return self.store.get_historical_data(symbol, interval, start_date, end_date, category)
+
+        base = self.get_base(symbol, end_date, category)
+        candles = self.update(category, symbol, interval, base)
+
+        start = pd.Timestamp(int(start_date.timestamp()*1000), unit='ms')
+        end = pd.Timestamp(int(end_date.timestamp()*1000), unit='ms')
+        return candles.loc[(candles.index >= start) & (candles.index <= end)]
+
+    def get_base(self, symbol:str, end_date:dt, category:str="inverse") -> pd.DataFrame:
+        # reuse a recent fetch that already reaches the bar forming at end_date
+        fetched = self.bases.get((category, symbol))
+        if fetched is not None and time.time() - fetched[0] < self.max_age:
+            end = pd.Timestamp(int(end_date.timestamp()*1000), unit='ms')
+            if fetched[1].index[-1] >= end - pd.Timedelta(milliseconds=INTERVAL_MS[self.base]):
+                return fetched[1]
+
+        base = self.store.get_historical_data(symbol, self.base, HISTORY_START, end_date, category)
+        if len(base) > 0:
+            self.bases[(category, symbol)] = (time.time(), base)
+        return base
+
+    def update(self, category:str, symbol:str, interval:str, base:pd.DataFrame) -> pd.DataFrame:
+        """
+        Brings the derived candles of a symbol up to date with its base candles
+        """
+        key = (category, symbol, interval)
+        cached = self.derived.get(key)
+
+        if cached is not None and len(cached['candles']) > 0:
+            # base rows before the last derived bar must be unchanged, otherwise a
+            # gap was filled in the history and everything is rebuilt
+            last_start = cached['last_start']
+            before = int(np.searchsorted(base.index.to_numpy(), last_start.to_datetime64()))
+            if before == cached['base_rows']:
+                tail = self.resample(base.iloc[before:], interval, drop_partial_start=False)
+                candles = pd.concat([cached['candles'].iloc[:-1], tail])
+                self.derived[key] = self.entry(candles, base)
+                return candles
+
+        candles = self.resample(base, interval)
+        self.derived[key] = self.entry(candles, base)
+        return candles
+
+    @staticmethod
+    def entry(candles:pd.DataFrame, base:pd.DataFrame) -> dict:
+        if len(candles) == 0:
+            return {'candles': candles, 'base_rows': 0, 'last_start': None}
+        last_start = candles.index[-1]
+        return {
+            'candles': candles,
+            'base_rows': int(np.searchsorted(base.index.to_numpy(), last_start.to_datetime64())),
+            'last_start': last_start
+        }
+
+    @staticmethod
+    def bucket_starts(index:pd.DatetimeIndex, interval:str) -> np.ndarray:
+        """
+        Open time (datetime64[ms]) of the interval bar each timestamp falls in
+        """
+        ts = index.to_numpy().astype('datetime64[ms]')
+        if interval == 'M':
+            return ts.astype('datetime64[M]').astype('datetime64[ms]')
+
+        ms = ts.astype('int64')
+        if interval == 'W':
+            week = 7 * 86_400_000
+            return ((ms - WEEK_ORIGIN_MS) // week * week + WEEK_ORIGIN_MS).astype('datetime64[ms]')
+
+        step = INTERVAL_MS[interval]
+        return (ms // step * step).astype('datetime64[ms]')
+
+    @staticmethod
+    def resample(base:pd.DataFrame, interval:str, drop_partial_start:bool=True) -> pd.DataFrame:
+        """
+        Aggregates base candles (ascending, bybit columns) into interval candles
+
+        Bar boundaries are found once and every column is a segment reduction.
+        The first bar is dropped when the base history starts after its open,
+        since it would be missing part of its range.
+        """
+        columns = [c for c in KLINE_COLUMNS if c != 'Date']
+        if len(base) == 0:
+            return pd.DataFrame(columns=columns, index=pd.DatetimeIndex([], name='Date'), dtype='float64')
+
+        buckets = Resampler.bucket_starts(base.index, interval)
+        starts = np.concatenate([[0], np.flatnonzero(buckets[1:] != buckets[:-1]) + 1])
+        ends = np.append(starts[1:], len(base)) - 1
+
+        candles = pd.DataFrame({
+            'Open': base['Open'].to_numpy()[starts],
+            'High': np.maximum.reduceat(base['High'].to_numpy(), starts),
+            'Low': np.minimum.reduceat(base['Low'].to_numpy(), starts),
+            'Close': base['Close'].to_numpy()[ends],
+            'Volume': np.add.reduceat(base['Volume'].to_numpy(), starts),
+            'Turnover': np.add.reduceat(base['Turnover'].to_numpy(), starts)
+        }, index=pd.DatetimeIndex(buckets[starts].astype('datetime64[ns]'), name='Date'))
+
+        if drop_partial_start and base.index[0] != candles.index[0]:
+            candles = candles.iloc[1:]
+        return candles
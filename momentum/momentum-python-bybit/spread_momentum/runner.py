@@ -0,0 +1,103 @@
+import pandas as pd
+from datetime import datetime as dt
+from itertools import product
+from concurrent.futures import ThreadPoolExecutor
+from .candle_store import CandleStore
+from .strategy import SpreadMomentum, HISTORY_START
+
+
+SIGNAL_COLUMNS = ['symbol', 'resolution', 'spread_period', 'z_threshold', 'date', 'close', 'z_score', 'next_day_position', 'position', 'error']
+
+
+class SignalRunner:
+    """
+    Computes SpreadMomentum signals for many symbols and settings without prompts
+
+    Every symbol's history is fetched once, concurrently, through one candle store
+    and so one shared Bybit session. Signals for every (spread_period, z_threshold)
+    are then built from the fetched data, so a full run takes about as long as the
+    slowest fetch.
+    """
+
+    def __init__(self, store:CandleStore=None, max_workers:int=16):
+        self.store = CandleStore() if store is None else store
+        self.max_workers = max_workers
+
+    def resolve_symbols(self, symbols) -> list:
+        # "all" selects every inverse symbol listed by the exchange
+        if symbols == 'all' or symbols == ['all']:
+            return list(self.store.trader.available_symbols)
+        return list(dict.fromkeys(symbols))
+
+    def fetch_all(self, symbols:list, resolution:str) -> dict:
+        """
+        Fetches the history of every symbol concurrently
+
+        Returns a dict of symbol -> dataframe, or the exception raised for that symbol
+        """
+        end_date = dt.now()
+
+        def fetch(symbol):
+            try:
+                return self.store.get_historical_data(symbol, resolution, start_date=HISTORY_START, end_date=end_date)
+            except Exception as e:
+                return e
+
+        # every symbol fetch runs its own page workers on the shared session
+        workers = max(1, min(self.max_workers, len(symbols)))
+        self.store.trader.resize_pool(workers * self.store.trader.max_workers)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(symbols, executor.map(fetch, symbols)))
+
+    def run(self, symbols, settings:list, resolution:str='D') -> pd.DataFrame:
+        """
+        Builds the latest signal for every symbol and setting
+
+        Parameters
+        ----------
+            symbols: list or str
+                symbols to run, or "all" for every inverse symbol
+
+            settings: list
+                (spread_period, z_threshold) pairs
+
+            resolution: str
+                bybit kline interval
+
+        Returns
+        -------
+            signals: pd.DataFrame
+                one row per symbol and setting with the last bar's date, close and
+                z-score, the position for the next bar and any error
+        """
+        symbols = self.resolve_symbols(symbols)
+        histories = self.fetch_all(symbols, resolution)
+
+        rows = []
+        for symbol, (spread_period, z_threshold) in product(symbols, settings):
+            row = {'symbol': symbol, 'resolution': resolution, 'spread_period': spread_period, 'z_threshold': z_threshold}
+            history = histories[symbol]
+            try:
+                if isinstance(history, Exception):
+                    raise history
+                if len(history) == 0:
+                    raise ValueError("Error. No candles returned.")
+                strategy = SpreadMomentum(symbol, resolution, spread_period, z_threshold, store=self.store, dataset=history)
+                last = strategy.built.iloc[-1]
+                row.update({
+                    'date': strategy.built.index[-1],
+                    'close': last['Close'],
+                    'z_score': last['z_score'],
+                    'next_day_position': last['next_day_position'],
+                    'position': self.position_name(last['next_day_position'])
+                })
+            except Exception as e:
+                row['error'] = f"{type(e).__name__}: {e}"
+            rows.append(row)
+
+        return pd.DataFrame(rows, columns=SIGNAL_COLUMNS)
+
+    @staticmethod
+    def position_name(position:float) -> str:
+        return "Long" if position == 1 else "Short" if position == -1 else "None"
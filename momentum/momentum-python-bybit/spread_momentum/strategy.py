@@ -1,29 +1,60 @@
 import pandas as pd 
 import numpy as np 
-from .bybit_trader import ByBitTrader
+from .bybit_trader import ByBitTrader, INTERVAL_MS
+from .candle_store import CandleStore
 from datetime import datetime as dt 
-import matplotlib.pyplot as plt 
-import mplfinance as mpf
 from .plots import Plots 
+from .sweep import ParameterSweep
+from .online import OnlineSpreadMomentum
+from performance.instrumentation import instrumented
+
+# first date requested for the signal history 
+HISTORY_START = dt(2014, 1, 1)
+
+
+def closed_bars(data:pd.DataFrame, resolution:str, now:pd.Timestamp=None) -> pd.DataFrame:
+    """
+    Bars of data that have closed by now (default: the current time, UTC) 
+
+    Bybit labels candles by open time in UTC, so a bar is complete once its open 
+    plus the interval has passed. Monthly bars end at the next month start. 
+    """
+    interval = str(resolution)
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"Error. Unsupported interval: {resolution}")
+
+    now = pd.Timestamp.now(tz='UTC').tz_localize(None) if now is None else pd.Timestamp(now)
+    if interval == 'M':
+        ends = (data.index.to_period('M') + 1).to_timestamp()
+    else:
+        ends = data.index + pd.Timedelta(milliseconds=INTERVAL_MS[interval])
+    return data[ends <= now]
+
 
 class SpreadMomentum: 
 
-    def __init__(self, symbol:str, resolution:any, spread_period:int=10, z_threshold:int=1):
+    def __init__(self, symbol:str, resolution:any, spread_period:int=10, z_threshold:int=1, store:CandleStore=None, dataset:pd.DataFrame=None):
         # Initialize symbol to generate signals 
         self.symbol = symbol 
         self.resolution = resolution 
         self.spread_period = spread_period
         self.z_threshold = z_threshold
 
-        # Create instance of ByBitTrader to fetch historical data 
-        self.bbt = ByBitTrader()
-        self.dataset = self.bbt.get_historical_data(symbol, resolution, start_date=dt(2014, 1,1), end_date=dt.now())
+        # Fetch historical data through the candle store if given, otherwise 
+        # download the full history with a new instance of ByBitTrader. 
+        # A dataset fetched beforehand (e.g. by SignalRunner) is used as is. 
+        self.bbt = ByBitTrader() if store is None else store.trader 
+        source = self.bbt if store is None else store 
+        if dataset is None: 
+            self.dataset = source.get_historical_data(symbol, resolution, start_date=HISTORY_START, end_date=dt.now())
+        else: 
+            self.dataset = dataset.copy()
 
         
-        # Exclude date today 
-        last_date = self.dataset[-1:].index.item().date()
-        if last_date == dt.now().date():
-            self.dataset = self.dataset[:len(self.dataset)-1]
+        # Exclude bars that have not closed yet. Datasets without a resolution 
+        # (signal_returns) are used as given. 
+        if self.resolution is not None: 
+            self.dataset = closed_bars(self.dataset, self.resolution)
 
         # Generates a dataframe containing signals 
         self.built = self.build_signal(self.dataset.copy())
@@ -32,6 +63,7 @@ class SpreadMomentum:
         # Create instance of Plots class 
         self.plots = Plots(self.built, self.symbol)
 
+    @instrumented('spread_momentum.build_signal')
     def build_signal(self, data:pd.DataFrame) -> pd.DataFrame:
 
         if not isinstance(data, pd.DataFrame):
@@ -48,15 +80,14 @@ class SpreadMomentum:
         data['z_score'] = (data['spread'] - data['spread_mean']) / data['spread_sdev']
 
         # Method for attaching signal based on entry and exit conditions 
+        # Writes the column in place instead of copying the whole frame 
         def attach(df, column_name, entry_mask, exit_mask, entry_signal, exit_signal): 
-            sig = df.copy()
-            sig[column_name] = np.nan
-            sig.loc[entry_mask, column_name] = entry_signal 
-            sig.loc[exit_mask, column_name] = exit_signal 
-            sig[column_name] = sig[column_name].ffill()
-            sig[column_name] = sig[column_name].fillna(0)
-
-            return sig 
+            sig = pd.Series(np.nan, index=df.index)
+            sig[entry_mask] = entry_signal 
+            sig[exit_mask] = exit_signal 
+            df[column_name] = sig.ffill().fillna(0)
+
+            return df 
         
         data['z_upper'] = self.z_threshold 
         data['z_lower'] = -self.z_threshold 
@@ -80,8 +111,39 @@ class SpreadMomentum:
 
         return data 
     
+    def sweep(self, spans, thresholds) -> pd.DataFrame:
+        """
+        Evaluates every (spread_period, z_threshold) combination on the dataset
+
+        Parameters
+        ----------
+            spans: array-like 
+                spread periods to test 
+
+            thresholds: array-like 
+                z-score thresholds to test 
+        """
+        return ParameterSweep(self.dataset['Close'], spans, thresholds).summary()
+    
+    def online(self) -> OnlineSpreadMomentum:
+        """
+        Returns an online signal warmed up on the dataset, to be fed new bars with update()
+        """
+        online = OnlineSpreadMomentum(self.spread_period, self.z_threshold)
+        online.run(self.dataset['Close'])
+        return online 
+    
     def get_signal_today(self):
         last_entry = self.built[-1:]['next_day_position'].item()
         position = "Long" if last_entry == 1 else "Short" if last_entry == -1 else "None"
         print(f"{self.symbol} Position for {dt.now().date()}: {position}")
 
+
+
+def signal_returns(data:pd.DataFrame, spread_period:int=10, z_threshold:float=1) -> pd.Series:
+    """
+    Per bar log returns of trading the signal built on data (candles with a Close
+    column), the strategy interface of performance.walk_forward
+    """
+    strategy = SpreadMomentum('walk_forward', None, spread_period, z_threshold, dataset=data)
+    return strategy.plots.returns['Strategy']
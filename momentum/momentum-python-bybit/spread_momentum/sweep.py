@@ -0,0 +1,93 @@
+import pandas as pd
+import numpy as np
+
+
+class ParameterSweep:
+    """
+    Evaluates the SpreadMomentum signal for many (spread_period, z_threshold)
+    combinations at once.
+
+    Z-scores are held as a (bars x spans) matrix and the long/short position
+    state machines as (bars x combos) matrices, so every threshold of a span
+    reuses the same z-score column.
+    """
+
+    def __init__(self, close:pd.Series, spans, thresholds):
+        self.close = close
+        self.spans = np.asarray(spans, dtype='int64')
+        self.thresholds = np.asarray(thresholds, dtype='float64')
+
+        if self.spans.ndim != 1 or self.thresholds.ndim != 1:
+            raise ValueError("Failed to run sweep. Spans and thresholds must be 1-D.")
+
+        self.log_returns = np.log(close / close.shift(1)).to_numpy(dtype='float64')
+        self.z_scores = self.z_score_matrix(close, self.spans)
+
+        # combos are ordered span-major: (span_0, thresh_0), (span_0, thresh_1) ...
+        self.combo_spans = np.repeat(self.spans, len(self.thresholds))
+        self.combo_thresholds = np.tile(self.thresholds, len(self.spans))
+
+        z = np.repeat(self.z_scores, len(self.thresholds), axis=1)
+        long_pos = self.positions(z >= self.combo_thresholds, z <= 0, 1)
+        short_pos = self.positions(z <= -self.combo_thresholds, z >= 0, -1)
+
+        # Calculated signal to be traded for the next bar. (To prevent look ahead bias)
+        self.next_day_position = long_pos + short_pos
+
+        self.signal = np.empty_like(self.next_day_position)
+        self.signal[0] = np.nan
+        self.signal[1:] = self.next_day_position[:-1]
+
+        self.strategy_returns = self.log_returns[:, None] * self.signal
+
+    @staticmethod
+    def z_score_matrix(close:pd.Series, spans:np.ndarray) -> np.ndarray:
+        """
+        Builds the z-score of the spread for every span, one column per span.
+
+        Uses the same pandas ewm calls as SpreadMomentum.build_signal so the
+        columns match it exactly.
+        """
+        z_scores = np.empty((len(close), len(spans)), dtype='float64')
+        for i, span in enumerate(spans):
+            spread = close - close.ewm(span=span).mean()
+            spread_ewm = spread.ewm(span=span)
+            z_scores[:, i] = ((spread - spread_ewm.mean()) / spread_ewm.std()).to_numpy()
+        return z_scores
+
+    @staticmethod
+    def positions(entry_mask:np.ndarray, exit_mask:np.ndarray, entry_signal:int) -> np.ndarray:
+        """
+        Vectorized equivalent of attach in SpreadMomentum.build_signal.
+
+        Each column holds entry_signal from an entry until the next exit, and 0
+        before the first event. Exits take precedence on bars matching both.
+        """
+        rows = np.arange(entry_mask.shape[0])[:, None]
+        events = entry_mask | exit_mask
+
+        # index of the last event at or before each bar
+        last_event = np.maximum.accumulate(np.where(events, rows, -1), axis=0)
+
+        value = np.where(exit_mask, 0, entry_signal)
+        held = np.take_along_axis(value, np.maximum(last_event, 0), axis=0)
+        return np.where(last_event >= 0, held, 0).astype('float64')
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Per combination return and drawdown statistics on log returns
+        """
+        cumulative = np.nancumsum(self.strategy_returns, axis=0)
+        drawdown = np.maximum.accumulate(cumulative, axis=0) - cumulative
+
+        position = self.next_day_position
+        changed = np.vstack([position[:1] != 0, position[1:] != position[:-1]])
+        trades = (changed & (position != 0)).sum(axis=0)
+
+        return pd.DataFrame({
+            'spread_period': self.combo_spans,
+            'z_threshold': self.combo_thresholds,
+            'total_return': cumulative[-1] if len(cumulative) > 0 else np.zeros(len(self.combo_spans)),
+            'max_drawdown': drawdown.max(axis=0) if len(drawdown) > 0 else np.zeros(len(self.combo_spans)),
+            'trades': trades
+        })
@@ -0,0 +1,188 @@
+import os
+import pandas as pd
+import numpy as np
+from datetime import datetime as dt
+from concurrent.futures import ProcessPoolExecutor
+
+
+# dataset arrays shared with each worker process once, instead of per window
+worker_data = None
+
+
+def search(dataset: pd.DataFrame, sym_1: str, sym_2: str, windows, thresholds, spreads = ('diff', 'ratio'),
+           train_end: dt = dt(2022, 1, 1), max_workers: int = None):
+    """
+    Grid search over the build / calc parameters of pairs_currency.ipynb.
+
+    Gives the same net train profit as optimize(w, spread, t, invert, hedge) for
+    every combination, without building a frame per combination:
+        - rolling statistics of each spread are computed once per window
+        - every threshold of a window is evaluated at once as a (bars x thresholds)
+          position matrix
+        - invert and hedge only flip the sign of each symbol's trade profit, so
+          the four flag combinations reuse the same trades
+        - windows are spread across worker processes
+
+    Parameters
+    ----------
+    dataset: pd.DataFrame
+        Combined dataset with {sym}_close and {sym}_cumm_returns columns for both symbols
+
+    sym_1: str
+        Base symbol
+
+    sym_2: str
+        Second symbol
+
+    windows: array-like
+        Rolling windows to test
+
+    thresholds: array-like
+        Signal thresholds to test
+
+    spreads: tuple
+        Spread types to test (diff, ratio)
+
+    train_end: dt
+        Trades opened before this date are counted
+
+    max_workers: int
+        Number of worker processes. Default: number of cores
+
+    Returns
+    -------
+    results: pd.DataFrame
+        window, spread, threshold, invert, hedge and net for every combination
+    """
+    assert type(dataset) == pd.DataFrame, 'Invalid Data Type for dataset'
+
+    for spread in spreads:
+        if spread not in ['diff', 'ratio']:
+            raise ValueError(f'Invalid spread: {spread}')
+
+    # same rows as build(), which starts from dataset.dropna()
+    data = dataset.dropna()
+    arrays = {
+        'close_1': data[f'{sym_1}_close'].to_numpy(dtype = 'float64'),
+        'close_2': data[f'{sym_2}_close'].to_numpy(dtype = 'float64'),
+        'diff': (data[f'{sym_1}_cumm_returns'] - data[f'{sym_2}_cumm_returns']).to_numpy(dtype = 'float64'),
+        'ratio': (data[f'{sym_1}_close'] / data[f'{sym_2}_close']).to_numpy(dtype = 'float64'),
+        'in_train': data.index.date < train_end.date()
+    }
+
+    thresholds = np.asarray(thresholds)
+    tasks = [(int(w), tuple(spreads), thresholds) for w in windows]
+
+    max_workers = os.cpu_count() if max_workers is None else max_workers
+    with ProcessPoolExecutor(max_workers = max_workers, initializer = init_worker, initargs = (arrays,)) as executor:
+        rows = [row for result in executor.map(evaluate_window, tasks) for row in result]
+
+    return pd.DataFrame(rows, columns = ['window', 'spread', 'threshold', 'invert', 'hedge', 'net'])
+
+
+def init_worker(arrays):
+    global worker_data
+    worker_data = arrays
+
+
+def evaluate_window(task):
+    """
+    Net train profit of every (spread, threshold, invert, hedge) for one window. Runs in the worker processes.
+    """
+    window, spreads, thresholds = task
+    data = worker_data
+
+    rows = []
+    for spread in spreads:
+        values = pd.Series(data[spread])
+        rolling = values.rolling(window)
+        normalized = ((values - rolling.mean()) / rolling.std()).shift(1).to_numpy()
+
+        # build() drops bars without a normalized spread
+        valid = ~np.isnan(normalized)
+        profit_1, profit_2 = trade_profits(
+            normalized[valid], thresholds, data['close_1'][valid], data['close_2'][valid], data['in_train'][valid]
+        )
+
+        for j, t in enumerate(thresholds):
+            for invert in [True, False]:
+                for hedge in [True, False]:
+                    # invert flips both legs, hedge flips the second leg
+                    sign_1 = -1 if invert else 1
+                    sign_2 = sign_1 * (-1 if hedge else 1)
+                    net = sign_1 * profit_1[j] + sign_2 * profit_2[j]
+                    rows.append([window, spread, t, invert, hedge, net])
+
+    return rows
+
+
+def trade_profits(normalized, thresholds, close_1, close_2, in_train):
+    """
+    Summed calc() trade_diff of both symbols, before invert and hedge, for every threshold.
+
+    Positions follow build() with invert_base = False: -1 above the threshold, 1 below
+    minus the threshold, held until the opposite signal. A trade opens on each change
+    of position after the first bar, and its profit is the position times the change
+    in close from its first bar to its last bar.
+    """
+    rows = np.arange(len(normalized))[:, None]
+    z = normalized[:, None]
+    thresholds = np.asarray(thresholds, dtype = 'float64')[None, :]
+
+    short = z > thresholds
+    long = z < -thresholds
+    events = short | long
+
+    # forward fill the last signal; bars before the first signal have no position
+    last_event = np.maximum.accumulate(np.where(events, rows, -1), axis = 0)
+    signal = np.where(long, 1.0, -1.0)
+    position = np.where(last_event >= 0, np.take_along_axis(signal, np.maximum(last_event, 0), axis = 0), np.nan)
+
+    # the first bar with a position is dropped by calc(), so it never opens a trade
+    previous = np.vstack([np.full((1, position.shape[1]), np.nan), position[:-1]])
+    opens = (position != previous) & ~np.isnan(previous) & ~np.isnan(position)
+
+    # a trade's last bar is the bar before the next change, or the final bar
+    following = np.vstack([position[1:], np.full((1, position.shape[1]), np.nan)])
+    is_last = position != following
+    last_bar = np.minimum.accumulate(np.where(is_last, rows, len(position))[::-1], axis = 0)[::-1]
+
+    counted = opens & in_train[:, None]
+    profit_1 = np.where(counted, position * (close_1[last_bar] - close_1[:, None]), 0).sum(axis = 0)
+    profit_2 = np.where(counted, position * (close_2[last_bar] - close_2[:, None]), 0).sum(axis = 0)
+
+    return profit_1, profit_2
+
+
+def portfolio_returns(dataset: pd.DataFrame, sym_1: str, sym_2: str, window: int, spread: str = 'diff',
+                      threshold: float = 3, invert: bool = True, hedge: bool = True) -> pd.Series:
+    """
+    Per bar portfolio_returns column of build() in pairs_currency.ipynb, for
+    performance.walk_forward. Bars that build() drops are left out.
+
+    Returns are summed changes in close of both legs, so score them with
+    objective = 'net'.
+    """
+    if spread not in ['diff', 'ratio']:
+        raise ValueError(f'Invalid spread: {spread}')
+
+    data = dataset.dropna()
+    if spread == 'diff':
+        values = data[f'{sym_1}_cumm_returns'] - data[f'{sym_2}_cumm_returns']
+    else:
+        values = data[f'{sym_1}_close'] / data[f'{sym_2}_close']
+
+    rolling = values.rolling(window)
+    normalized = ((values - rolling.mean()) / rolling.std()).shift(1)
+
+    # above the threshold build() goes short the base, or long when inverted
+    above = 1 if invert else -1
+    position_1 = pd.Series(np.nan, index = data.index)
+    position_1[normalized > threshold] = above
+    position_1[normalized < -threshold] = -above
+    position_1 = position_1.ffill()
+    position_2 = -position_1 if hedge else position_1
+
+    returns = data[f'{sym_1}_returns'] * position_1 + data[f'{sym_2}_returns'] * position_2
+    valid = normalized.notna() & position_1.notna()
+    return returns[valid].rename('portfolio_returns')
@@ -0,0 +1,114 @@
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+
+# price matrix shared with each worker process once, instead of per pair
+worker_prices = None
+
+
+def scan_pairs(prices: pd.DataFrame, min_correlation: float = 0.8, maxlag: int = 1, max_workers: int = None, chunk_size: int = 64):
+    """
+    Scans a universe of aligned price series for cointegrated pairs.
+
+    Candidate pairs are prefiltered with one correlation matrix. Hedge ratios
+    of the survivors come from the same covariance matrix (OLS of the first
+    asset on the second, with a constant). The ADF test on each spread
+    (first - hedge_ratio * second) runs in a process pool.
+
+    Parameters
+    ----------
+    prices: pd.DataFrame
+        One column of prices per asset. Rows with any missing price are dropped.
+
+    min_correlation: float
+        Minimum absolute price correlation for a pair to be tested. Negatively
+        correlated pairs are kept and get a negative hedge ratio.
+        Default: 0.8
+
+    maxlag: int
+        maxlag passed to adfuller
+        Default: 1
+
+    max_workers: int
+        Number of worker processes. Default: number of cores
+
+    chunk_size: int
+        Number of pairs sent to a worker at a time
+
+    Returns
+    -------
+    pairs: pd.DataFrame
+        asset_1, asset_2, correlation, hedge_ratio, intercept, test_statistic and
+        p_value for each tested pair, ranked by p_value then test_statistic
+    """
+    assert type(prices) == pd.DataFrame, 'Invalid Data Type for prices'
+
+    prices = prices.dropna()
+    if prices.shape[1] < 2:
+        raise ValueError('At least two assets are required')
+
+    values = prices.to_numpy(dtype = 'float64')
+    names = prices.columns.to_numpy()
+
+    cov = np.cov(values, rowvar = False)
+    sdev = np.sqrt(np.diag(cov))
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        corr = cov / np.outer(sdev, sdev)
+
+    first, second = np.triu_indices(len(names), k = 1)
+    keep = np.abs(corr[first, second]) >= min_correlation
+    first, second = first[keep], second[keep]
+
+    # OLS of first on second: slope = cov / var, intercept = mean_1 - slope * mean_2
+    hedge_ratio = cov[first, second] / cov[second, second]
+    means = values.mean(axis = 0)
+    intercept = means[first] - hedge_ratio * means[second]
+
+    tasks = [(first[i:i+chunk_size], second[i:i+chunk_size], hedge_ratio[i:i+chunk_size], maxlag) for i in range(0, len(first), chunk_size)]
+
+    max_workers = os.cpu_count() if max_workers is None else max_workers
+    with ProcessPoolExecutor(max_workers = max_workers, initializer = init_worker, initargs = (values,)) as executor:
+        results = list(executor.map(test_chunk, tasks))
+
+    test_statistic = np.concatenate([r[0] for r in results]) if results else np.array([])
+    p_value = np.concatenate([r[1] for r in results]) if results else np.array([])
+
+    pairs = pd.DataFrame({
+        'asset_1': names[first],
+        'asset_2': names[second],
+        'correlation': corr[first, second],
+        'hedge_ratio': hedge_ratio,
+        'intercept': intercept,
+        'test_statistic': test_statistic,
+        'p_value': p_value
+    })
+
+    return pairs.sort_values(['p_value', 'test_statistic']).reset_index(drop = True)
+
+
+def init_worker(values):
+    global worker_prices
+    worker_prices = values
+
+
+def test_chunk(task):
+    """
+    Runs the ADF test on the spreads of a chunk of pairs. Runs in the worker processes.
+    """
+    from statsmodels.tsa.stattools import adfuller
+
+    first, second, hedge_ratio, maxlag = task
+    test_statistic = np.full(len(first), np.nan)
+    p_value = np.full(len(first), np.nan)
+
+    for i in range(len(first)):
+        spread = worker_prices[:, first[i]] - hedge_ratio[i] * worker_prices[:, second[i]]
+        try:
+            test_statistic[i], p_value[i] = adfuller(spread, maxlag = maxlag)[:2]
+        except (ValueError, np.linalg.LinAlgError):
+            # constant or degenerate spread
+            continue
+
+    return test_statistic, p_value
@@ -0,0 +1,103 @@
+import pandas as pd
+import numpy as np
+
+
+def segment_starts(position: np.ndarray) -> np.ndarray:
+    """
+    Index of the first bar of each run of equal positions. Always starts with 0.
+    """
+    previous = position[:-1]
+    current = position[1:]
+    # NaN != NaN, so runs of missing positions are merged explicitly
+    changed = (previous != current) & ~(np.isnan(previous) & np.isnan(current))
+    return np.concatenate([[0], np.flatnonzero(changed) + 1])
+
+
+def trade_ledger(position, high, low, close, index = None, first_bar_entry: bool = False) -> pd.DataFrame:
+    """
+    One row per trade from per-bar positions and prices.
+
+    Same trades as calc() in pairs_currency.ipynb: a trade opens on the bar its
+    position changes, is entered and exited at the close of its first and last
+    bar, and its excursion is the lowest low / highest high over those bars.
+    Segment boundaries are found once and every per-trade value is a segment
+    reduction, so no per-bar columns are added.
+
+    Parameters
+    ----------
+    position: array-like
+        Position held on each bar (1 long, -1 short, 0 or NaN flat)
+
+    high: array-like
+        High of each bar
+
+    low: array-like
+        Low of each bar
+
+    close: array-like
+        Close of each bar
+
+    index: array-like
+        Timestamps of each bar. Default: index of position if it is a Series, else bar numbers
+
+    first_bar_entry: bool
+        Count the position held from the first bar as a trade. calc() skips it,
+        since it is not opened by a change.
+        Default: False
+
+    Returns
+    -------
+    trades: pd.DataFrame
+        entry_time, exit_time, position, bars, entry_price, exit_price, highest,
+        lowest, mae, mfe and profit for every trade. mae and mfe are the adverse
+        and favorable excursions from the entry price, in price units.
+    """
+    if index is None:
+        index = position.index if isinstance(position, pd.Series) else np.arange(len(position))
+    index = np.asarray(index)
+
+    position = np.asarray(position, dtype = 'float64')
+    high = np.asarray(high, dtype = 'float64')
+    low = np.asarray(low, dtype = 'float64')
+    close = np.asarray(close, dtype = 'float64')
+
+    if not (len(position) == len(high) == len(low) == len(close) == len(index)):
+        raise ValueError('Error. Position and price arrays must have the same length.')
+
+    if len(position) == 0:
+        starts = np.array([], dtype = 'int64')
+        ends = starts
+    else:
+        starts = segment_starts(position)
+        ends = np.append(starts[1:], len(position)) - 1
+
+    highest = np.maximum.reduceat(high, starts) if len(starts) else np.array([])
+    lowest = np.minimum.reduceat(low, starts) if len(starts) else np.array([])
+
+    side = position[starts]
+    entry_price = close[starts]
+    exit_price = close[ends]
+
+    keep = ~np.isnan(side) & (side != 0)
+    if not first_bar_entry:
+        keep &= starts > 0
+
+    # adverse excursion is the move against the position, favorable the move with it
+    mae = np.where(side > 0, entry_price - lowest, highest - entry_price)
+    mfe = np.where(side > 0, highest - entry_price, entry_price - lowest)
+
+    trades = pd.DataFrame({
+        'entry_time': index[starts],
+        'exit_time': index[ends],
+        'position': side,
+        'bars': ends - starts + 1,
+        'entry_price': entry_price,
+        'exit_price': exit_price,
+        'highest': highest,
+        'lowest': lowest,
+        'mae': mae,
+        'mfe': mfe,
+        'profit': side * (exit_price - entry_price)
+    })
+
+    return trades.loc[keep].reset_index(drop = True)
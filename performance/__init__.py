@@ -0,0 +1,3 @@
+from .metrics import *
+from .rendering import *
+from .memory import *
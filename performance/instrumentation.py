@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import threading
+import functools
+import tracemalloc
+import pandas as pd
+
+
+# Spans are only recorded after enable(), or when the PIPELINE_TRACE environment
+# variable names a JSON lines file. While disabled, span() hands back one shared
+# no-op object and instrumented functions make a single dict lookup.
+state = {'enabled': False, 'memory': False, 'path': None, 'records': []}
+
+lock = threading.Lock()
+local = threading.local()
+
+
+class NullSpan:
+
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        # rows set inside a disabled span are dropped
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+
+    """
+    Records wall time, rows processed and peak allocated memory of a block.
+
+    Set rows on the span inside the block when the count is only known there.
+    Spans opened inside another span on the same thread record it as parent.
+    Peak memory needs enable(memory = True) and is approximate when spans
+    run concurrently on several threads, since tracemalloc keeps one peak.
+    """
+
+    def __init__(self, name: str, rows: int = None, **attrs):
+        self.name = name
+        self.rows = rows
+        self.attrs = attrs
+        self.peak = 0
+
+    def __enter__(self):
+        stack = getattr(local, 'stack', None)
+        if stack is None:
+            stack = local.stack = []
+        self.parent = stack[-1] if stack else None
+        stack.append(self)
+
+        if state['memory']:
+            current, peak = tracemalloc.get_traced_memory()
+            # keep the parent's peak so far before restarting the count
+            if self.parent is not None:
+                self.parent.peak = max(self.parent.peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = current
+
+        self.start_time = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        local.stack.pop()
+
+        peak_mb = None
+        if state['memory']:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if self.parent is not None:
+                self.parent.peak = max(self.parent.peak, self.peak)
+            peak_mb = (self.peak - self.start_memory) / 1024**2
+
+        record = {
+            'name': self.name,
+            'parent': None if self.parent is None else self.parent.name,
+            'start': self.start_time,
+            'seconds': seconds,
+            'rows': None if self.rows is None else int(self.rows),
+            'peak_mb': peak_mb,
+            'thread': threading.current_thread().name,
+            'error': None if exc_type is None else exc_type.__name__,
+            **self.attrs
+        }
+        with lock:
+            state['records'].append(record)
+            if state['path'] is not None:
+                with open(state['path'], 'a') as f:
+                    f.write(json.dumps(record, default = str) + '\n')
+        return False
+
+
+def enable(path: str = None, memory: bool = False, reset: bool = True):
+    """
+    Starts recording spans
+
+    Parameters
+    ----------
+    path: str
+        JSON lines file every finished span is appended to. Default: memory only
+
+    memory: bool
+        Track peak allocated memory with tracemalloc. Slows the traced code down.
+        Default: False
+
+    reset: bool
+        Clears the spans recorded so far
+        Default: True
+    """
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if reset:
+        state['records'] = []
+    state.update(enabled = True, memory = memory, path = path)
+
+
+def disable():
+    """
+    Stops recording spans. Recorded spans are kept.
+    """
+    if state['memory'] and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    state.update(enabled = False, memory = False, path = None)
+
+
+def span(name: str, rows: int = None, **attrs):
+    """
+    Context manager timing a named block, e.g.
+
+        with span('fetch', symbol = symbol) as s:
+            data = fetch(symbol)
+            s.rows = len(data)
+    """
+    if not state['enabled']:
+        return NULL_SPAN
+    return Span(name, rows, **attrs)
+
+
+def instrumented(name: str, rows = None):
+    """
+    Decorator recording a span around every call of a function
+
+    rows: callable
+        Called as rows(result, *args, **kwargs) to count the rows processed.
+        Default: len(result) for dataframes, series and arrays
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not state['enabled']:
+                return func(*args, **kwargs)
+
+            with Span(name) as s:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    s.rows = rows(result, *args, **kwargs)
+                elif hasattr(result, 'shape'):
+                    s.rows = len(result)
+            return result
+        return wrapper
+    return decorator
+
+
+def records() -> list:
+    """
+    Spans recorded since enable()
+    """
+    return list(state['records'])
+
+
+def load_jsonl(path: str) -> list:
+    """
+    Spans from a JSON lines file written by enable(path)
+    """
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def export_jsonl(path: str, spans: list = None):
+    """
+    Writes spans (default: the recorded ones) to a JSON lines file
+    """
+    spans = records() if spans is None else spans
+    with open(path, 'w') as f:
+        for record in spans:
+            f.write(json.dumps(record, default = str) + '\n')
+
+
+def summary(spans: list = None) -> pd.DataFrame:
+    """
+    Per stage totals: calls, total / mean / max seconds, rows, rows per second
+    and the largest peak memory, slowest stage first
+    """
+    spans = records() if spans is None else spans
+    columns = ['calls', 'total_s', 'mean_s', 'max_s', 'rows', 'rows_per_s', 'peak_mb']
+    if not spans:
+        return pd.DataFrame(columns = columns).rename_axis('name')
+
+    frame = pd.DataFrame(spans)
+    for col in ['rows', 'peak_mb']:
+        if col not in frame.columns:
+            frame[col] = None
+    frame[['rows', 'peak_mb']] = frame[['rows', 'peak_mb']].astype('float64')
+
+    grouped = frame.groupby('name')
+    table = pd.DataFrame({
+        'calls': grouped.size(),
+        'total_s': grouped['seconds'].sum(),
+        'mean_s': grouped['seconds'].mean(),
+        'max_s': grouped['seconds'].max(),
+        'rows': grouped['rows'].sum(min_count = 1),
+        'peak_mb': grouped['peak_mb'].max()
+    })
+    table['rows_per_s'] = table['rows'] / table['total_s']
+    return table[columns].sort_values('total_s', ascending = False)
+
+
+if os.environ.get('PIPELINE_TRACE'):
+    enable(os.environ['PIPELINE_TRACE'], memory = os.environ.get('PIPELINE_TRACE_MEMORY') == '1')
@@ -0,0 +1,105 @@
+import pandas as pd
+import numpy as np
+
+
+def memory_mb(frame) -> float:
+    """
+    Deep memory usage of a dataframe or series in MB, including string contents.
+    """
+    usage = frame.memory_usage(deep = True)
+    return float(usage.sum() if isinstance(usage, pd.Series) else usage) / 1024**2
+
+
+def price_decimals(values: np.ndarray, max_decimals: int = 8) -> int:
+    """
+    Fewest decimals every finite value is written with, i.e. the tick size as a
+    power of ten. None when values need more than max_decimals, e.g. computed ratios.
+    """
+    finite = values[np.isfinite(values)]
+    for decimals in range(max_decimals + 1):
+        scaled = finite * 10.0**decimals
+        # allow float64 representation error, far below one tick
+        if np.all(np.abs(scaled - np.round(scaled)) <= 1e-9 * np.maximum(1, np.abs(scaled))):
+            return decimals
+    return None
+
+
+def fits_float32(values: np.ndarray, decimals: int = None) -> bool:
+    """
+    True if float64 values survive a float32 round trip at their tick size: every
+    float32 value rounds back to the original price. decimals defaults to
+    price_decimals(values), values without a tick size never fit.
+    """
+    decimals = price_decimals(values) if decimals is None else decimals
+    if decimals is None:
+        return False
+
+    with np.errstate(over = 'ignore', invalid = 'ignore'):
+        narrowed = values.astype('float32').astype('float64')
+    finite = np.isfinite(values)
+    if not np.array_equal(finite, np.isfinite(narrowed)):
+        return False
+    return bool(np.all(np.abs(narrowed[finite] - values[finite]) < 0.5 * 10.0**-decimals))
+
+
+def compact_frame(frame: pd.DataFrame, keep: list = None, float32: bool = True, decimals: int = None,
+                  max_categories: int = 1000) -> pd.DataFrame:
+    """
+    Smaller copy of a dataframe for large intraday datasets
+
+    Parameters
+    ----------
+    frame: pd.DataFrame
+        Data to compact
+
+    keep: list
+        Columns to keep, dropping intermediates. Default: all
+
+    float32: bool
+        Store float64 columns as float32 when every value round trips at its tick size
+        Default: True
+
+    decimals: int
+        Tick size of the float columns as decimals. Default: inferred per column
+
+    max_categories: int
+        String columns with at most this many distinct values become categoricals
+
+    Returns
+    -------
+    frame: pd.DataFrame
+        Integers downcast to the smallest type holding their range, low cardinality
+        strings as categoricals and floats as float32 where precision allows
+    """
+    assert type(frame) == pd.DataFrame, 'Invalid Data Type for frame'
+
+    frame = frame[keep] if keep is not None else frame
+    columns = {}
+    for col in frame.columns:
+        series = frame[col]
+        if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            columns[col] = series
+        elif pd.api.types.is_integer_dtype(series):
+            columns[col] = pd.to_numeric(series, downcast = 'integer')
+        elif pd.api.types.is_float_dtype(series):
+            values = series.to_numpy(dtype = 'float64')
+            columns[col] = series.astype('float32') if float32 and fits_float32(values, decimals) else series
+        elif (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)) and series.nunique() <= max_categories:
+            columns[col] = series.astype('category')
+        else:
+            columns[col] = series
+    return pd.DataFrame(columns, index = frame.index)
+
+
+def memory_report(frames: dict) -> pd.DataFrame:
+    """
+    Rows, deep memory (MB) and bytes per row of named dataframes, largest first
+    """
+    rows = []
+    for name, frame in frames.items():
+        if frame is None:
+            continue
+        mb = memory_mb(frame)
+        rows.append([name, len(frame), mb, mb * 1024**2 / len(frame) if len(frame) else np.nan])
+    report = pd.DataFrame(rows, columns = ['name', 'rows', 'mb', 'bytes_per_row']).set_index('name')
+    return report.sort_values('mb', ascending = False)
@@ -0,0 +1,183 @@
+import pandas as pd
+import numpy as np
+
+
+# units of the returns passed in
+return_kinds = ['log', 'simple', 'percent']
+month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def as_frame(returns) -> pd.DataFrame:
+    """
+    Returns as a (bars x strategies) dataframe. A Series becomes one column.
+    """
+    if isinstance(returns, pd.Series):
+        return returns.to_frame(returns.name if returns.name is not None else 'returns')
+    assert type(returns) == pd.DataFrame, 'Invalid Data Type for returns'
+    return returns
+
+
+def to_simple(values: np.ndarray, kind: str) -> np.ndarray:
+    """
+    Converts log, simple or percent returns to simple returns.
+    """
+    if kind not in return_kinds:
+        raise ValueError(f'Invalid return kind: {kind}. Allowed kinds: {return_kinds}')
+    if kind == 'log':
+        return np.expm1(values)
+    if kind == 'percent':
+        return values / 100
+    return values
+
+
+def infer_periods_per_year(index) -> float:
+    """
+    Bars per year from the span of a DatetimeIndex. Default: 252 for other indexes.
+    """
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return 252
+    years = (index[-1] - index[0]).total_seconds() / (365.25 * 86400)
+    return (len(index) - 1) / years if years > 0 else 252
+
+
+def performance_summary(returns, kind: str = 'log', periods_per_year: float = None) -> pd.DataFrame:
+    """
+    Return statistics of every strategy (column) of a returns matrix in one pass
+
+    Parameters
+    ----------
+    returns: pd.DataFrame or pd.Series
+        Per bar returns, one column per strategy. NaN bars are skipped.
+
+    kind: str
+        Units of returns: log, simple or percent
+        Default: log
+
+    periods_per_year: float
+        Bars per year used to annualize. Default: inferred from a DatetimeIndex, else 252
+
+    Returns
+    -------
+    summary: pd.DataFrame
+        total_return, cagr, volatility, sharpe, sortino and max_drawdown (all as
+        fractions, compounded) and the number of bars, one row per strategy
+    """
+    frame = as_frame(returns)
+    periods_per_year = infer_periods_per_year(frame.index) if periods_per_year is None else periods_per_year
+
+    simple = to_simple(frame.to_numpy(dtype = 'float64'), kind)
+    bars = (~np.isnan(simple)).sum(axis = 0)
+
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        mean = np.nanmean(simple, axis = 0) if len(simple) else np.full(simple.shape[1], np.nan)
+        std = np.nanstd(simple, axis = 0, ddof = 1) if len(simple) else np.full(simple.shape[1], np.nan)
+        downside = np.sqrt(np.nanmean(np.minimum(simple, 0) ** 2, axis = 0)) if len(simple) else np.full(simple.shape[1], np.nan)
+
+        # compounded equity, starting from 1
+        equity = np.exp(np.nancumsum(np.log1p(simple), axis = 0))
+        equity = np.vstack([np.ones((1, simple.shape[1])), equity])
+        peak = np.maximum.accumulate(equity, axis = 0)
+        max_drawdown = (1 - equity / peak).max(axis = 0)
+
+        total_return = equity[-1] - 1
+        years = bars / periods_per_year
+        cagr = np.where(years > 0, equity[-1] ** (1 / years) - 1, np.nan)
+
+        annual_factor = np.sqrt(periods_per_year)
+        summary = pd.DataFrame({
+            'total_return': total_return,
+            'cagr': cagr,
+            'volatility': std * annual_factor,
+            'sharpe': mean / std * annual_factor,
+            'sortino': mean / downside * annual_factor,
+            'max_drawdown': max_drawdown,
+            'bars': bars
+        }, index = frame.columns)
+
+    return summary
+
+
+def equity_curve(returns, kind: str = 'log') -> pd.DataFrame:
+    """
+    Compounded growth of 1 for every strategy. NaN bars leave the equity unchanged.
+    """
+    frame = as_frame(returns)
+    log_returns = np.log1p(to_simple(frame.to_numpy(dtype = 'float64'), kind))
+    return pd.DataFrame(np.exp(np.nancumsum(log_returns, axis = 0)), index = frame.index, columns = frame.columns)
+
+
+def drawdown_curve(returns, kind: str = 'log') -> pd.DataFrame:
+    """
+    Drawdown of every strategy from its running peak equity, as a fraction.
+    """
+    equity = equity_curve(returns, kind)
+    peak = np.maximum(np.maximum.accumulate(equity.to_numpy(), axis = 0), 1)
+    return 1 - equity / peak
+
+
+def period_returns(returns, periods, kind: str = 'log', compound: bool = False) -> pd.DataFrame:
+    """
+    Returns of every strategy summed or compounded over groups of bars.
+    """
+    frame = as_frame(returns)
+    if not compound:
+        return frame.groupby(periods).sum()
+
+    log_returns = pd.DataFrame(np.log1p(to_simple(frame.to_numpy(dtype = 'float64'), kind)), index = frame.index, columns = frame.columns)
+    return np.expm1(log_returns.groupby(periods).sum())
+
+
+def annual_returns(returns, kind: str = 'log', compound: bool = False) -> pd.DataFrame:
+    """
+    Returns by calendar year, one column per strategy
+
+    compound: bool
+        False sums the returns in their own units, True gives the compounded
+        simple return of each year
+    """
+    frame = as_frame(returns)
+    return period_returns(frame, frame.index.year, kind, compound).rename_axis('year')
+
+
+def monthly_returns(returns, kind: str = 'log', compound: bool = False) -> pd.DataFrame:
+    """
+    Returns by calendar month (a monthly PeriodIndex), one column per strategy
+
+    compound: bool
+        False sums the returns in their own units, True gives the compounded
+        simple return of each month
+    """
+    frame = as_frame(returns)
+    return period_returns(frame, frame.index.to_period('M'), kind, compound).rename_axis('month')
+
+
+def month_of_year_returns(returns, calculation: str = 'mean') -> pd.DataFrame:
+    """
+    Mean, sum or std of the bar returns in each month of the year (Jan to Dec),
+    pooled across years, one column per strategy
+    """
+    if calculation not in ['mean', 'sum', 'std']:
+        raise ValueError('Calculation not in calculations list. Allowed Calculations: "mean", "sum", "std"')
+
+    frame = as_frame(returns)
+    grouped = frame.groupby(frame.index.month).agg(calculation)
+    grouped.index = [month_names[m - 1] for m in grouped.index]
+    return grouped.reindex(month_names)
+
+
+def performance_report(returns, kind: str = 'log', periods_per_year: float = None, compound: bool = False) -> dict:
+    """
+    Headless report of a returns matrix: summary statistics, annual and monthly
+    tables, without plotting
+
+    Returns
+    -------
+    report: dict
+        summary, annual and monthly dataframes
+    """
+    frame = as_frame(returns)
+    return {
+        'summary': performance_summary(frame, kind, periods_per_year),
+        'annual': annual_returns(frame, kind, compound),
+        'monthly': monthly_returns(frame, kind, compound)
+    }
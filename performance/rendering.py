@@ -0,0 +1,183 @@
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from .metrics import annual_returns, drawdown_curve, equity_curve, performance_summary
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling
+
+    Keeps the first and last point and, from each of threshold - 2 buckets, the
+    point forming the largest triangle with the previously kept point and the
+    mean of the next bucket, so peaks and troughs survive.
+
+    Parameters
+    ----------
+    x: np.ndarray
+        Increasing x values
+
+    y: np.ndarray
+        y values, without NaN
+
+    threshold: int
+        Number of points to keep
+
+    Returns
+    -------
+    indices: np.ndarray
+        Positions of the kept points, increasing
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype = 'float64')
+    y = np.asarray(y, dtype = 'float64')
+
+    # bucket edges over the points between the first and last
+    edges = (np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype('int64') + 1
+    edges[-1] = n - 1
+
+    indices = np.empty(threshold, dtype = 'int64')
+    indices[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        area = np.abs((x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+
+    indices[-1] = n - 1
+    return indices
+
+
+def downsample(series: pd.Series, max_points: int = 2000) -> pd.Series:
+    """
+    LTTB downsampled copy of a series for plotting. The global minimum and
+    maximum are always kept. NaN values are dropped first.
+    """
+    series = series.dropna()
+    if len(series) <= max_points:
+        return series
+
+    index = series.index
+    x = index.asi8.astype('float64') if isinstance(index, pd.DatetimeIndex) else np.arange(len(series), dtype = 'float64')
+    y = series.to_numpy(dtype = 'float64')
+
+    keep = lttb(x, y, max_points)
+    keep = np.union1d(keep, [y.argmin(), y.argmax()])
+    return series.iloc[keep]
+
+
+def init_worker():
+    # renders to files only, no display needed
+    import matplotlib
+    matplotlib.use('Agg', force = True)
+
+
+def render_report(job: dict) -> dict:
+    """
+    Renders the figures and summary of one report job to its output folder.
+    Runs in the worker processes.
+
+    Returns
+    -------
+    files: dict
+        name and the paths written
+    """
+    import matplotlib.pyplot as plt
+
+    name = job['name']
+    returns = job['returns']
+    kind = job.get('kind', 'log')
+    max_points = job.get('max_points', 2000)
+    output_dir = os.path.join(job['output_dir'], name)
+    os.makedirs(output_dir, exist_ok = True)
+
+    files = []
+
+    def save(fig, file_name):
+        path = os.path.join(output_dir, file_name)
+        fig.savefig(path, dpi = job.get('dpi', 100), bbox_inches = 'tight')
+        plt.close(fig)
+        files.append(path)
+
+    summary_path = os.path.join(output_dir, 'summary.csv')
+    performance_summary(returns, kind, job.get('periods_per_year')).to_csv(summary_path)
+    files.append(summary_path)
+
+    for title, curve, ylabel in [('Equity', equity_curve(returns, kind), 'Growth of 1'),
+                                 ('Drawdown', drawdown_curve(returns, kind), 'Drawdown')]:
+        fig, ax = plt.subplots(figsize = (12, 6))
+        for col in curve.columns:
+            points = downsample(curve[col], max_points)
+            ax.plot(points.index, points.to_numpy(), label = col)
+        ax.set_title(f'{name} {title}')
+        ax.set_ylabel(ylabel)
+        ax.legend()
+        save(fig, f'{title.lower()}.png')
+
+    fig, ax = plt.subplots(figsize = (12, 6))
+    annual_returns(returns, kind, compound = True).plot(kind = 'bar', ax = ax)
+    ax.set_title(f'{name} Annual Returns')
+    ax.set_ylabel('Returns')
+    save(fig, 'annual_returns.png')
+
+    # extra indicator series, e.g. z_score
+    for label, series in job.get('series', {}).items():
+        points = downsample(series, max_points)
+        fig, ax = plt.subplots(figsize = (12, 4))
+        ax.plot(points.index, points.to_numpy())
+        ax.set_title(f'{name} {label}')
+        save(fig, f'{label}.png')
+
+    return {'name': name, 'files': files}
+
+
+def render_reports(jobs: list, output_dir: str = 'reports', max_workers: int = None, max_points: int = 2000) -> pd.DataFrame:
+    """
+    Renders report figures for many symbols to files, in parallel worker
+    processes with the non-interactive Agg backend
+
+    Parameters
+    ----------
+    jobs: list
+        One dict per symbol with name (str), returns (pd.DataFrame, one column per
+        strategy) and optionally kind (log, simple, percent), periods_per_year and
+        series (dict of label -> pd.Series of extra lines to plot, e.g. z_score)
+
+    output_dir: str
+        Folder for the reports, one subfolder per name
+
+    max_workers: int
+        Number of worker processes. Default: number of cores
+
+    max_points: int
+        Points per plotted line after LTTB downsampling
+
+    Returns
+    -------
+    files: pd.DataFrame
+        name and path of every file written
+    """
+    names = [job['name'] for job in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError('Error. Report names must be unique.')
+
+    jobs = [{**job, 'output_dir': output_dir, 'max_points': job.get('max_points', max_points)} for job in jobs]
+
+    max_workers = os.cpu_count() if max_workers is None else max_workers
+    with ProcessPoolExecutor(max_workers = max_workers, initializer = init_worker) as executor:
+        results = list(executor.map(render_report, jobs))
+
+    rows = [(result['name'], path) for result in results for path in result['files']]
+    return pd.DataFrame(rows, columns = ['name', 'path'])
@@ -0,0 +1,231 @@
+import os
+import pandas as pd
+import numpy as np
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+
+from .metrics import infer_periods_per_year, performance_summary
+
+
+# scores walk_forward can optimize: summed returns or a performance_summary column
+objectives = ['net', 'total_return', 'cagr', 'volatility', 'sharpe', 'sortino', 'max_drawdown']
+lower_is_better = ['volatility', 'max_drawdown']
+
+# strategy and dataset shared with each worker process once, instead of per parameter set
+worker_data = None
+
+
+def split_folds(index: pd.Index, train_size, test_size, anchored: bool = False) -> list:
+    """
+    Consecutive train / test folds over an ascending index
+
+    Parameters
+    ----------
+    index: pd.Index
+        Bars to split, usually a DatetimeIndex
+
+    train_size: int, pd.DateOffset or pd.Timedelta
+        Length of the first train fold, in bars (int) or time. Strings are read
+        as a pd.Timedelta, e.g. '730D'
+
+    test_size: int, pd.DateOffset or pd.Timedelta
+        Length of every test fold. Folds move forward by one test fold.
+
+    anchored: bool
+        If True every train fold starts at the first bar and grows, otherwise
+        it rolls forward with a fixed length
+        Default: False
+
+    Returns
+    -------
+    folds: list
+        (train, test) position slices. The last test fold may be shorter.
+    """
+    train_size = pd.Timedelta(train_size) if type(train_size) == str else train_size
+    test_size = pd.Timedelta(test_size) if type(test_size) == str else test_size
+
+    by_bars = isinstance(train_size, (int, np.integer))
+    if by_bars != isinstance(test_size, (int, np.integer)):
+        raise ValueError('Error. train_size and test_size must both be bars or both be time.')
+    if by_bars and (train_size < 1 or test_size < 1):
+        raise ValueError('Error. Fold sizes must be at least one bar.')
+    if not by_bars and len(index) and not index[0] + test_size > index[0]:
+        raise ValueError('Error. test_size must be a positive length of time.')
+
+    n = len(index)
+    folds = []
+    k = 0
+    while True:
+        if by_bars:
+            train_start = 0 if anchored else k * test_size
+            train_end = train_size + k * test_size
+            test_end = min(train_end + test_size, n)
+        else:
+            # offsets are multiplied, not added repeatedly, so month ends do not drift
+            start = index[0]
+            train_start = 0 if anchored else int(index.searchsorted(start + test_size * k))
+            train_end = int(index.searchsorted(start + train_size + test_size * k))
+            test_end = int(index.searchsorted(start + train_size + test_size * (k + 1)))
+
+        if train_end >= n:
+            break
+        if train_end > train_start and test_end > train_end:
+            folds.append((slice(train_start, train_end), slice(train_end, test_end)))
+        k += 1
+
+    return folds
+
+
+def walk_forward(strategy, data: pd.DataFrame, param_grid: dict, train_size, test_size, anchored: bool = False,
+                 objective = 'sharpe', kind: str = 'log', periods_per_year: float = None, max_workers: int = None):
+    """
+    Walk-forward optimization of a strategy over a parameter grid
+
+    Every train fold picks the parameters with the best objective, which are then
+    traded on the following test fold. The out of sample returns of all test folds
+    make up the walk-forward result.
+
+    A strategy is any callable strategy(data, **params) returning per bar returns
+    as a pd.Series indexed like data, for example
+        - pairs_trading/optimizer.portfolio_returns, the build() of pairs_currency.ipynb
+        - spread_momentum.signal_returns, SpreadMomentum.build_signal
+        - seasonality.backtest_returns, Seasonality.backtest with walk_forward = True
+
+    Strategies must be causal, each bar's return only depending on earlier data,
+    so they are run once per parameter set on the full dataset, spread across
+    worker processes, and each fold scores slices of those returns. Rolling folds
+    limit the bars scored, strategies still use earlier history as warm up.
+
+    Parameters
+    ----------
+    strategy: callable
+        strategy(data, **params) -> pd.Series of returns. Use functools.partial to
+        fix arguments that are not optimized. Must be importable by the worker
+        processes, so functions defined in a notebook need max_workers = 1 on Windows.
+
+    data: pd.DataFrame
+        Dataset passed to the strategy, a copy per call
+
+    param_grid: dict
+        Parameter name -> values to test. Every combination is evaluated.
+
+    train_size, test_size, anchored:
+        Fold layout, see split_folds
+
+    objective: str or callable
+        net (summed returns, for point or price differences), a performance_summary
+        column (total_return, cagr, volatility, sharpe, sortino, max_drawdown), or a
+        callable scoring a returns Series, higher is better
+        Default: sharpe
+
+    kind: str
+        Units of the returns: log, simple or percent
+        Default: log
+
+    periods_per_year: float
+        Bars per year used to annualize. Default: inferred from the bars the
+        strategy returns for any parameter set
+
+    max_workers: int
+        Number of worker processes, 1 runs in this process. Default: number of cores
+
+    Returns
+    -------
+    folds: pd.DataFrame
+        One row per fold: train and test dates, the chosen parameters, their train
+        and test scores and bar counts
+
+    returns: pd.Series
+        Out of sample returns of the chosen parameters over every test fold, on
+        the bars the strategy returned
+    """
+    assert type(data) == pd.DataFrame, 'Invalid Data Type for data'
+    assert type(param_grid) == dict, 'Invalid Data Type for param_grid'
+
+    if not callable(objective) and objective not in objectives:
+        raise ValueError(f'Error. Invalid objective: {objective}. Allowed objectives: {objectives}')
+
+    folds = split_folds(data.index, train_size, test_size, anchored)
+    if not folds:
+        raise ValueError('Error. Dataset too short for a train and test fold.')
+
+    names = list(param_grid.keys())
+    combos = [dict(zip(names, values)) for values in product(*param_grid.values())]
+
+    max_workers = os.cpu_count() if max_workers is None else max_workers
+    if max_workers == 1:
+        init_worker(strategy, data)
+        columns = [evaluate_params(params) for params in combos]
+    else:
+        with ProcessPoolExecutor(max_workers = max_workers, initializer = init_worker, initargs = (strategy, data)) as executor:
+            columns = list(executor.map(evaluate_params, combos, chunksize = max(1, len(combos) // (4 * max_workers))))
+
+    # (bars x parameter sets) returns, aligned on the dataset index
+    matrix = pd.DataFrame(np.column_stack(columns), index = data.index)
+    if periods_per_year is None:
+        # annualize by the bars strategies return, not the dataset's, so skipped days
+        # (weekends, filtered sessions) do not inflate the ratios
+        traded = matrix.notna().any(axis = 1).to_numpy()
+        periods_per_year = infer_periods_per_year(data.index[traded])
+
+    rows = []
+    out_of_sample = []
+    for k, (train, test) in enumerate(folds):
+        train_scores = score(matrix.iloc[train], objective, kind, periods_per_year)
+        ranked = -train_scores if objective in lower_is_better else train_scores
+
+        row = {
+            'fold': k,
+            'train_start': data.index[train][0],
+            'train_end': data.index[train][-1],
+            'test_start': data.index[test][0],
+            'test_end': data.index[test][-1]
+        }
+        if np.all(np.isnan(ranked)):
+            # no parameter set traded in this train fold, its test fold is left out
+            row.update({name: None for name in names})
+            row.update(train_score = np.nan, test_score = np.nan, train_bars = 0, test_bars = 0)
+            rows.append(row)
+            continue
+
+        best = int(np.nanargmax(ranked))
+        test_returns = matrix.iloc[test, best]
+        row.update(combos[best])
+        row.update(
+            train_score = train_scores[best],
+            test_score = score(test_returns.to_frame(), objective, kind, periods_per_year)[0],
+            train_bars = int(matrix.iloc[train, best].notna().sum()),
+            test_bars = int(test_returns.notna().sum())
+        )
+        rows.append(row)
+        out_of_sample.append(test_returns.dropna())
+
+    returns = pd.concat(out_of_sample) if out_of_sample else pd.Series(dtype = 'float64')
+    return pd.DataFrame(rows), returns.rename('walk_forward')
+
+
+def score(returns: pd.DataFrame, objective, kind: str, periods_per_year: float) -> np.ndarray:
+    """
+    Objective of every column of a returns matrix, NaN for columns without returns
+    """
+    if callable(objective):
+        return returns.apply(lambda col: objective(col.dropna()) if col.notna().any() else np.nan).to_numpy(dtype = 'float64')
+    if objective == 'net':
+        return returns.sum(min_count = 1).to_numpy(dtype = 'float64')
+
+    summary = performance_summary(returns, kind = kind, periods_per_year = periods_per_year)
+    return np.where(summary['bars'] > 0, summary[objective], np.nan).astype('float64')
+
+
+def init_worker(strategy, data):
+    global worker_data
+    worker_data = (strategy, data)
+
+
+def evaluate_params(params: dict) -> np.ndarray:
+    """
+    Returns of one parameter set on the dataset index. Runs in the worker processes.
+    """
+    strategy, data = worker_data
+    returns = strategy(data.copy(), **params)
+    return returns.reindex(data.index).to_numpy(dtype = 'float64')
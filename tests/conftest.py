@@ -0,0 +1,9 @@
+import os
+import sys
+
+# project folders are not installed packages, so tests import them from the tree
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ['', 'momentum/momentum-python-bybit', 'crude_seasonality', 'mean_reversion', 'pairs_trading', 'datasets']:
+    path = os.path.join(REPO_ROOT, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
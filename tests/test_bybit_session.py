@@ -0,0 +1,58 @@
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from spread_momentum import ByBitTrader, SignalRunner
+
+
+class SlowHTTP:
+    """
+    Stand-in for pybit's HTTP that counts instances and is slow to build
+    """
+    created = 0
+    lock = threading.Lock()
+
+    def __init__(self, testnet=False):
+        time.sleep(0.05)
+        with SlowHTTP.lock:
+            SlowHTTP.created += 1
+
+
+def test_session_created_once_across_threads(monkeypatch):
+    unified_trading = types.ModuleType('pybit.unified_trading')
+    unified_trading.HTTP = SlowHTTP
+    monkeypatch.setitem(sys.modules, 'pybit', types.ModuleType('pybit'))
+    monkeypatch.setitem(sys.modules, 'pybit.unified_trading', unified_trading)
+    SlowHTTP.created = 0
+
+    trader = ByBitTrader()
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        sessions = list(executor.map(lambda _: trader.session, range(64)))
+
+    assert SlowHTTP.created == 1
+    assert all(session is sessions[0] for session in sessions)
+
+
+class EmptyStore:
+    """
+    Candle store that returns no candles, around a real trader
+    """
+
+    def __init__(self, trader):
+        self.trader = trader
+
+    def get_historical_data(self, symbol, interval, start_date, end_date, category="inverse"):
+        return ByBitTrader.parse_json_result([])
+
+
+def test_runner_sizes_pool_for_symbol_and_page_workers():
+    client = requests.Session()
+    trader = ByBitTrader(session=types.SimpleNamespace(client=client), max_workers=8, pool_size=32)
+    SignalRunner(store=EmptyStore(trader), max_workers=16).fetch_all([f'SYM{i}USD' for i in range(20)], 'D')
+
+    assert trader.pool_size == 16 * 8
+    assert client.get_adapter('https://api.bybit.com')._pool_maxsize == 16 * 8
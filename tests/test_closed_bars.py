@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from root import RESOLUTIONS
+from spread_momentum import SpreadMomentum, closed_bars
+
+
+# Wednesday 2024-05-15 13:30 UTC
+NOW = pd.Timestamp('2024-05-15 13:30')
+
+# resolution -> (bar opens, last closed bar)
+CASES = {
+    '60': (pd.date_range('2024-05-14', NOW, freq='h'), pd.Timestamp('2024-05-15 12:00')),
+    '240': (pd.date_range('2024-05-14', NOW, freq='4h'), pd.Timestamp('2024-05-15 08:00')),
+    'D': (pd.date_range('2024-05-01', NOW, freq='D'), pd.Timestamp('2024-05-14')),
+    'W': (pd.date_range('2024-04-01', NOW, freq='W-MON'), pd.Timestamp('2024-05-06')),
+}
+
+
+def candles(index):
+    return pd.DataFrame({'Close': range(1, len(index) + 1)}, index=index, dtype='float64')
+
+
+def test_cases_cover_prompt_resolutions():
+    assert sorted(CASES) == sorted(RESOLUTIONS)
+
+
+@pytest.mark.parametrize('resolution', sorted(CASES))
+def test_forming_bar_is_dropped(resolution):
+    index, last_closed = CASES[resolution]
+    closed = closed_bars(candles(index), resolution, now=NOW)
+
+    assert closed.index[-1] == last_closed
+    # every bar before the forming one is kept, including bars closed earlier today
+    assert len(closed) == len(index) - 1
+
+
+def test_bar_closing_exactly_now_is_kept():
+    index = pd.date_range('2024-05-15 10:00', periods=4, freq='h')
+    closed = closed_bars(candles(index), '60', now=pd.Timestamp('2024-05-15 13:00'))
+    assert closed.index[-1] == pd.Timestamp('2024-05-15 12:00')
+
+
+def test_monthly_bar_closes_at_next_month():
+    index = pd.date_range('2024-01-01', periods=5, freq='MS')
+    closed = closed_bars(candles(index), 'M', now=pd.Timestamp('2024-05-01'))
+    assert closed.index[-1] == pd.Timestamp('2024-04-01')
+
+
+def test_unknown_resolution_raises():
+    with pytest.raises(ValueError):
+        closed_bars(candles(pd.date_range('2024-05-01', periods=3)), '7')
+
+
+def test_strategy_drops_forming_weekly_bar():
+    # the weekly bar opened this Monday is still forming on any later day
+    index = pd.date_range('2020-01-06', periods=200, freq='W-MON')
+    monday = pd.Timestamp.now(tz='UTC').tz_localize(None).normalize()
+    monday -= pd.Timedelta(days=monday.dayofweek)
+    index = index.append(pd.DatetimeIndex([monday]))
+
+    strategy = SpreadMomentum('BTCUSD', 'W', dataset=candles(index))
+    assert strategy.dataset.index[-1] < monday
@@ -0,0 +1,40 @@
+import numpy as np
+
+import investing
+
+
+CSV = '''"Date","Price","Open","High","Low","Vol.","Change %"
+"01/04/2024","1,010.50","1,000.00","1,020.00","995.00","621.20K","1.05%"
+"01/03/2024","1,000.00","990.00","1,005.00","985.00","2.66M","-0.50%"
+"01/02/2024","1,005.00","1,000.00","1,010.00","998.00","","0.00%"
+'''
+
+
+def write_csv(tmp_path):
+    path = tmp_path / 'prices.csv'
+    path.write_text(CSV, encoding='utf-8')
+    return str(path)
+
+
+def test_cache_miss_and_hit_load_the_same_frame(tmp_path):
+    path = write_csv(tmp_path)
+    parsed = investing.load_csv(path)
+    cached = investing.load_csv(path)
+
+    assert parsed.equals(cached)
+    assert list(parsed['Volume']) == [0, 2_660_000, 621_200]
+
+
+def test_frames_from_both_paths_are_writable(tmp_path):
+    path = write_csv(tmp_path)
+    for _ in range(2):
+        # first load parses the csv, second maps the sidecar
+        data = investing.load_csv(path)
+        data.loc[data.index[0], 'Price'] = -1.0
+        data['Open'] *= 2
+        assert data['Price'].iloc[0] == -1.0
+
+    # edits stay in memory, the sidecar keeps the parsed values
+    data = investing.load_csv(path)
+    assert np.array_equal(data['Price'].to_numpy(), [1005.0, 1000.0, 1010.5])
+    assert data['Open'].iloc[0] == 1000.0
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from performance.memory import compact_frame, fits_float32, price_decimals
+
+
+def test_price_decimals():
+    assert price_decimals(np.array([1.23456, 1.2345, 1.2])) == 5
+    assert price_decimals(np.array([65432.5, 65433.0])) == 1
+    assert price_decimals(np.array([1 / 3, 2 / 3])) is None
+
+
+def test_fx_prices_fit_float32():
+    rng = np.random.default_rng(0)
+    prices = np.round(1.1 + np.cumsum(rng.normal(0, 1e-4, 10000)), 5)
+    assert fits_float32(prices)
+
+
+def test_prices_needing_more_precision_stay_float64():
+    # float32 spacing near 1.2e6 is 0.125, coarser than a 0.01 tick
+    large = np.array([1234567.89, 1234567.91, 1234568.03])
+    # returns and ratios have no tick size
+    ratios = np.array([1 / 3, 2 / 7, 5 / 11])
+    assert not fits_float32(large)
+    assert not fits_float32(ratios)
+
+    frame = compact_frame(pd.DataFrame({'large': large, 'ratio': ratios, 'price': [1.5, 1.25, 1.75]}))
+    assert frame['large'].dtype == 'float64'
+    assert frame['ratio'].dtype == 'float64'
+    assert frame['price'].dtype == 'float32'
+
+
+def test_compact_frame_drops_intermediates_and_downcasts():
+    frame = pd.DataFrame({
+        'close': [1.5, 1.25, 1.75],
+        'helper': [0.1, 0.2, 0.3],
+        'year': np.array([2020, 2021, 2022], dtype='int64'),
+        'month': ['Jan', 'Feb', 'Jan'],
+    })
+    compact = compact_frame(frame, keep=['close', 'year', 'month'])
+    assert list(compact.columns) == ['close', 'year', 'month']
+    assert compact['year'].dtype == 'int16'
+    assert isinstance(compact['month'].dtype, pd.CategoricalDtype)
@@ -0,0 +1,24 @@
+import os
+
+import pandas as pd
+import pytest
+
+from mt4_report import MT4Report
+
+
+REPORTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'crude_seasonality', 'mt4_simulations')
+
+
+@pytest.mark.parametrize('report', ['XTIUSD_sim_report.csv', 'XBRUSD_sim_report.csv'])
+def test_summary_identical_for_any_chunk_size(report):
+    path = os.path.join(REPORTS, report)
+    small_stats, small_monthly = MT4Report(path, chunksize=37).summary()
+    large_stats, large_monthly = MT4Report(path, chunksize=100000).summary()
+
+    assert small_stats == large_stats
+    pd.testing.assert_series_equal(small_monthly, large_monthly, check_exact=True)
+
+    # net profit agrees with the report's own balance column
+    balance = pd.read_csv(path)['Balance']
+    assert large_stats['final_balance'] - large_stats['starting_balance'] == pytest.approx(large_stats['net_profit'], abs=1e-6)
+    assert large_stats['final_balance'] == balance.iloc[-1]
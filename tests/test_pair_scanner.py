@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from pair_scanner import scan_pairs
+
+
+def test_negatively_correlated_pair_is_scanned():
+    rng = np.random.default_rng(1)
+    base = 100 + np.cumsum(rng.normal(0, 1, 1000))
+    prices = pd.DataFrame({
+        'A': base,
+        # moves against A around a stationary spread
+        'B': 300 - base + rng.normal(0, 0.5, 1000),
+        'C': 100 + np.cumsum(rng.normal(0, 1, 1000)),
+    })
+
+    pairs = scan_pairs(prices, min_correlation=0.8, max_workers=1)
+    pair = pairs.loc[(pairs['asset_1'] == 'A') & (pairs['asset_2'] == 'B')].iloc[0]
+
+    assert pair['correlation'] < -0.8
+    assert pair['hedge_ratio'] < 0
+    assert pair['p_value'] < 0.01
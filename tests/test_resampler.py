@@ -0,0 +1,50 @@
+from datetime import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from spread_momentum import CandleStore, Resampler
+from spread_momentum.bybit_trader import INTERVAL_MS
+
+
+class FakeTrader:
+    """
+    Serves synthetic candles for any interval and records the intervals requested
+    """
+
+    def __init__(self):
+        self.requests = []
+
+    def get_historical_data(self, symbol, interval, start_date, end_date, category="inverse"):
+        self.requests.append(interval)
+        step = pd.Timedelta(milliseconds=INTERVAL_MS[interval])
+        start = pd.Timestamp(int(start_date.timestamp()*1000), unit='ms').ceil(step)
+        end = pd.Timestamp(int(end_date.timestamp()*1000), unit='ms')
+        index = pd.date_range(start, end, freq=step, name='Date')
+        close = 100 + np.arange(len(index), dtype='float64')
+        return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                             'Volume': 1.0, 'Turnover': 1.0}, index=index)
+
+
+def make_resampler(tmp_path):
+    trader = FakeTrader()
+    return Resampler(CandleStore(trader, directory=str(tmp_path)), base='60'), trader
+
+
+def test_cold_daily_then_weekly_downloads_base_once(tmp_path):
+    resampler, trader = make_resampler(tmp_path)
+    daily = resampler.get_historical_data('BTCUSD', 'D', dt(2024, 1, 1), dt(2024, 3, 1))
+    weekly = resampler.get_historical_data('BTCUSD', 'W', dt(2024, 1, 1), dt(2024, 3, 1))
+
+    assert trader.requests == ['60']
+    assert len(daily) > 0 and len(weekly) > 0
+
+
+def test_daily_derived_from_cached_hourly(tmp_path):
+    resampler, trader = make_resampler(tmp_path)
+    resampler.store.get_historical_data('BTCUSD', '60', dt(2014, 1, 1), dt(2024, 3, 1))
+    trader.requests.clear()
+
+    daily = resampler.get_historical_data('BTCUSD', 'D', dt(2024, 1, 1), dt(2024, 3, 1))
+    assert 'D' not in trader.requests
+    assert len(daily) > 0
@@ -0,0 +1,50 @@
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mean_reversion import Mean_Reversion
+
+
+def prices(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(np.exp(np.cumsum(rng.normal(0, 0.01, n))))
+
+
+def rolling_hurst(close, window, step=1):
+    # get_rolling_hurst only reads the dataset, the adf / hurst summary is not needed
+    mr = Mean_Reversion.__new__(Mean_Reversion)
+    mr.dataset = close
+    return mr.get_rolling_hurst(window, step)
+
+
+@pytest.mark.parametrize('window, step', [(100, 1), (350, 7)])
+def test_matches_compute_hc(window, step):
+    hurst = pytest.importorskip('hurst')
+    close = prices(800)
+    result = rolling_hurst(close, window, step)
+
+    for end in result.index[::5]:
+        H, _, _ = hurst.compute_Hc(close.iloc[end - window + 1:end + 1].to_numpy(), kind='price', simplified=True)
+        assert result[end] == pytest.approx(H, rel=1e-9)
+
+
+def test_window_much_larger_than_chunk_size():
+    # a per window gather of the size 10 chunks alone would take about 780 MB
+    close = prices(200_000)
+    window = 5000
+    gather_bytes = (len(close) - window + 1) * (window // 10) * 8
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = rolling_hurst(close, window)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert len(result) == len(close) - window + 1
+    assert np.isfinite(result).all()
+    assert peak < gather_bytes / 4
+    assert seconds < 30
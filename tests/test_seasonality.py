@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from seasonality import Seasonality
+
+
+STRATS = ['d_sig_returns', 'filtered_returns', 'strategy_returns', 'actual_returns', 'pct_change']
+
+
+def make_prices():
+    # calendar days, so weekend bars are kept and dropped like in FRED data
+    rng = np.random.default_rng(3)
+    index = pd.date_range('2019-01-01', periods = 1200, freq = 'D', name = 'Date')
+    returns = rng.normal(0, 0.01, size = (len(index), 2))
+    prices = pd.DataFrame(60 * np.exp(np.cumsum(returns, axis = 0)), index = index, columns = ['WTI', 'BRENT'])
+    # a shorter asset, so assets do not share their last day
+    prices.iloc[-30:, 1] = np.nan
+    return prices
+
+
+@pytest.mark.parametrize('start_date, end_date', [(None, None), ('2019-06-01', '2022-01-01')])
+def test_backtest_panel_matches_backtest_per_asset(start_date, end_date):
+    prices = make_prices()
+    panel = Seasonality(start_date, end_date).backtest_panel(prices)
+
+    for asset in prices.columns:
+        seasonality = Seasonality(start_date, end_date)
+        seasonality.update_daily_data(prices[[asset]].dropna().rename(columns = {asset: 'Close'}))
+        single = seasonality.backtest()
+
+        assert panel.loc[asset, 'bars'] == len(single)
+        for strat in STRATS:
+            assert panel.loc[asset, strat] == pytest.approx(single[strat].sum(), rel = 1e-9)
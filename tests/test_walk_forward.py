@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from performance.metrics import infer_periods_per_year, performance_summary
+from performance.walk_forward import split_folds, walk_forward
+
+
+def weekday_returns(data, scale=1.0):
+    # trades weekdays only, like a day of week filter on calendar daily data
+    returns = data['returns'] * scale
+    return returns[returns.index.dayofweek < 5]
+
+
+def calendar_data():
+    index = pd.date_range('2018-01-01', '2021-12-31', freq='D')
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({'returns': rng.normal(0.0005, 0.01, len(index))}, index=index)
+
+
+def test_split_folds_rolling_and_anchored():
+    index = pd.RangeIndex(100)
+    rolling = split_folds(index, 40, 20)
+    anchored = split_folds(index, 40, 20, anchored=True)
+
+    assert [(f[0].start, f[0].stop, f[1].stop) for f in rolling] == [(0, 40, 60), (20, 60, 80), (40, 80, 100)]
+    assert [(f[0].start, f[0].stop, f[1].stop) for f in anchored] == [(0, 40, 60), (0, 60, 80), (0, 80, 100)]
+
+
+def test_annualizes_by_traded_bars():
+    data = calendar_data()
+    folds, returns = walk_forward(weekday_returns, data, {'scale': [1.0]}, pd.DateOffset(years=2),
+                                  pd.DateOffset(years=1), objective='sharpe', max_workers=1)
+
+    traded = data.index[data.index.dayofweek < 5]
+    periods_per_year = infer_periods_per_year(traded)
+    assert periods_per_year == pytest.approx(261, abs=1)
+
+    first = folds.iloc[0]
+    train = weekday_returns(data).loc[first['train_start']:first['train_end']]
+    expected = performance_summary(train, kind='log', periods_per_year=periods_per_year)['sharpe'].iloc[0]
+    assert first['train_score'] == pytest.approx(expected)
+    assert len(returns) == folds['test_bars'].sum()